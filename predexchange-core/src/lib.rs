@@ -31,12 +31,12 @@ impl OrderbookEngine {
         self.bids.clear();
         self.asks.clear();
         for (p, s) in bids {
-            if s >= 0.0 && p >= 0.0 && p <= 1.0 {
+            if s > 0.0 && p >= 0.0 && p <= 1.0 {
                 self.bids.insert(price_to_key(p), s);
             }
         }
         for (p, s) in asks {
-            if s >= 0.0 && p >= 0.0 && p <= 1.0 {
+            if s > 0.0 && p >= 0.0 && p <= 1.0 {
                 self.asks.insert(price_to_key(p), s);
             }
         }
@@ -45,8 +45,13 @@ impl OrderbookEngine {
 
     /// Apply delta: side "BUY" or "SELL", price, size. Size 0 removes level.
     fn apply_delta(&mut self, side: &str, price: f64, size: f64) {
+        self.apply_delta_returning_prev_size(side, price, size);
+    }
+
+    /// Same as apply_delta but returns the size previously at that level (0.0 if none or ignored).
+    fn apply_delta_returning_prev_size(&mut self, side: &str, price: f64, size: f64) -> f64 {
         if !self.has_snapshot {
-            return;
+            return 0.0;
         }
         let key = price_to_key(price);
         let map = if side.eq_ignore_ascii_case("BUY") {
@@ -54,11 +59,36 @@ impl OrderbookEngine {
         } else {
             &mut self.asks
         };
-        if size <= 0.0 {
-            map.remove(&key);
+        let prev = if size <= 0.0 {
+            map.remove(&key)
         } else {
-            map.insert(key, size);
-        }
+            map.insert(key, size)
+        };
+        prev.unwrap_or(0.0)
+    }
+
+    /// Top N levels per side as (price, size): bids best (highest) first, asks best (lowest) first.
+    fn depth_at_levels(&self, n: usize) -> (Vec<(f64, f64)>, Vec<(f64, f64)>) {
+        let bids = self.bids.iter().rev().take(n).map(|(k, s)| (key_to_price(*k), *s)).collect();
+        let asks = self.asks.iter().take(n).map(|(k, s)| (key_to_price(*k), *s)).collect();
+        (bids, asks)
+    }
+
+    /// Sum of sizes over the top N levels per side: (bid volume, ask volume).
+    fn top_volumes(&self, n: usize) -> (f64, f64) {
+        let bid_vol: f64 = self.bids.values().rev().take(n).sum();
+        let ask_vol: f64 = self.asks.values().take(n).sum();
+        (bid_vol, ask_vol)
+    }
+
+    /// Bid levels with lo <= price <= hi, ascending by price.
+    fn bids_in_range(&self, lo: f64, hi: f64) -> Vec<(f64, f64)> {
+        range_levels(&self.bids, lo, hi)
+    }
+
+    /// Ask levels with lo <= price <= hi, ascending by price.
+    fn asks_in_range(&self, lo: f64, hi: f64) -> Vec<(f64, f64)> {
+        range_levels(&self.asks, lo, hi)
     }
 
     #[getter]
@@ -95,6 +125,15 @@ fn key_to_price(k: u64) -> f64 {
     k as f64 / 1_000_000.0
 }
 
+fn range_levels(map: &BTreeMap<u64, f64>, lo: f64, hi: f64) -> Vec<(f64, f64)> {
+    if lo > hi {
+        return Vec::new();
+    }
+    map.range(price_to_key(lo)..=price_to_key(hi))
+        .map(|(k, s)| (key_to_price(*k), *s))
+        .collect()
+}
+
 /// Python module entry point.
 #[pymodule]
 fn predexchange_core(m: &Bound<'_, PyModule>) -> PyResult<()> {
@@ -6,6 +6,7 @@ import asyncio
 import json
 import time
 from contextlib import asynccontextmanager
+from itertools import islice
 from pathlib import Path
 from typing import Any
 
@@ -32,7 +33,7 @@ from predexchange.replay.engine import (
     replay_to_chart_series,
     replay_to_mid_series,
 )
-from predexchange.storage.db import get_connection, init_schema
+from predexchange.storage.db import get_connection, get_pooled_connection, init_schema
 from predexchange.storage.event_log import log_stats, normalize_condition_id
 from predexchange.storage.markets import list_markets as storage_list_markets
 from predexchange.ingestion.polymarket.gamma import (
@@ -48,14 +49,18 @@ from predexchange.simulation.runner import get_run_result
 _run_with_ingestion = False
 _run_with_sports = False
 _config_profile: str | None = None
+# Sports WS messages are buffered and upserted together at this interval
+_SPORTS_FLUSH_INTERVAL_SEC = 0.5
 
 
 def _get_conn():
     settings = get_settings(_config_profile)
     # With ingestion in-process, DuckDB requires same config for all connections to the same file; use read_only=False to match ingestion.
-    read_only = not (_run_with_ingestion or _run_with_sports)
-    conn = get_connection(settings.db_path, read_only=read_only)
-    return conn
+    if _run_with_ingestion or _run_with_sports:
+        # This process owns the file, so request connections can be pooled (close() returns them)
+        return get_pooled_connection(settings.db_path, read_only=False)
+    # Otherwise a separate writer may need the lock between requests: open per request
+    return get_connection(settings.db_path, read_only=True)
 
 
 @asynccontextmanager
@@ -89,23 +94,50 @@ async def lifespan(app: FastAPI):
 
     sports_task = None
     sports_stop = None
+    sports_flush = None
     if _run_with_sports:
+        import structlog
+
         from predexchange.ingestion.polymarket.sports_ws import run_sports_ws
-        from predexchange.storage.sports import upsert_sport_result
+        from predexchange.storage.sports import upsert_sport_results
 
         settings = get_settings(_config_profile)
         db_path = settings.db_path
+        sports_pending: list[tuple[dict[str, Any], int]] = []
 
         def _on_sport_result(payload: dict[str, Any], ingest_ts: int) -> None:
+            sports_pending.append((payload, ingest_ts))
+
+        def _flush_sport_results() -> None:
+            if not sports_pending:
+                return
+            batch = sports_pending[:]
+            sports_pending.clear()
             c = get_connection(db_path, read_only=False)
             try:
                 init_schema(c)
-                upsert_sport_result(c, payload, ingest_ts)
+                upsert_sport_results(c, batch)
             finally:
                 c.close()
 
+        async def _flush_sport_results_periodically(stop: asyncio.Event) -> None:
+            # One connection + one upsert per interval instead of per message
+            while not stop.is_set():
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=_SPORTS_FLUSH_INTERVAL_SEC)
+                except asyncio.TimeoutError:
+                    pass
+                try:
+                    _flush_sport_results()
+                except Exception as e:
+                    structlog.get_logger().warning("sports_flush_error", error=str(e))
+
+        sports_flush = _flush_sport_results
         sports_stop = asyncio.Event()
-        sports_task = asyncio.create_task(run_sports_ws(_on_sport_result, stop_event=sports_stop))
+        sports_task = asyncio.gather(
+            run_sports_ws(_on_sport_result, stop_event=sports_stop),
+            _flush_sport_results_periodically(sports_stop),
+        )
 
     yield
 
@@ -116,6 +148,8 @@ async def lifespan(app: FastAPI):
     if sports_task is not None and sports_stop is not None:
         sports_stop.set()
         await sports_task
+    if sports_flush is not None:
+        sports_flush()  # results delivered after the flush loop's last pass
 
 
 app = FastAPI(title="PredExchange API", version="0.1.0", lifespan=lifespan)
@@ -149,7 +183,7 @@ def markets_list(
     """List markets with optional limit/offset."""
     conn = _get_conn()
     try:
-        all_markets = storage_list_markets(conn, tracked_only=tracked_only)
+        all_markets = storage_list_markets(conn, tracked_only=tracked_only, with_outcomes=True)
         total = len(all_markets)
         markets = all_markets[offset : offset + limit]
         return MarketsListResponse(markets=markets, total=total)
@@ -195,25 +229,24 @@ def market_timeseries(
     conn = _get_conn()
     try:
         series = replay_to_mid_series(conn, market_id, asset_id, start_ts=start_ts, end_ts=end_ts)
-        if len(series) > max_points:
-            step = len(series) // max_points
-            series = series[:: max(1, step)][:max_points]
-        return {"market_id": market_id, "asset_id": asset_id, "series": [{"t": t, "mid": m} for t, m in series]}
+        step = max(1, len(series) // max_points)
+        points = [{"t": t, "mid": m} for t, m in islice(series.points(step), max_points)]
+        return {"market_id": market_id, "asset_id": asset_id, "series": points}
     finally:
         conn.close()
 
 
+_UPSERT_LAST_MID_SQL = """INSERT INTO last_mid (market_id, asset_id, mid, updated_at) VALUES (?, ?, ?, ?)
+   ON CONFLICT (market_id, asset_id) DO UPDATE SET mid = excluded.mid, updated_at = excluded.updated_at"""
+
+
 def _upsert_last_mid(conn: Any, market_id: str, asset_id: str, mid: float) -> None:
     """Write last known mid for this (market_id, asset_id). Swallow errors to avoid 500s under concurrent load."""
     if mid is None or not (0 <= mid <= 1):
         return
     try:
         now_ms = int(time.time() * 1000)
-        conn.execute(
-            """INSERT INTO last_mid (market_id, asset_id, mid, updated_at) VALUES (?, ?, ?, ?)
-               ON CONFLICT (market_id, asset_id) DO UPDATE SET mid = excluded.mid, updated_at = excluded.updated_at""",
-            [market_id, asset_id, mid, now_ms],
-        )
+        conn.execute(_UPSERT_LAST_MID_SQL, [market_id, asset_id, mid, now_ms])
     except Exception:
         pass  # avoid 500 when DuckDB conflicts under concurrent chart/series + book_heatmap
 
@@ -1,5 +1,7 @@
 """Replay subcommand: run, list."""
 
+from itertools import islice
+
 import typer
 
 from predexchange.replay.engine import replay_events, replay_to_mid_series
@@ -37,7 +39,7 @@ def run_replay(
         if asset:
             series = replay_to_mid_series(conn, market, asset, start_ts=start_ts, end_ts=end_ts)
             typer.echo(f"Replayed {len(series)} events -> {len(series)} mid points")
-            for ts, mid in series[:20]:
+            for ts, mid in islice(series.points(), 20):
                 typer.echo(f"  {ts}  {mid}")
             if len(series) > 20:
                 typer.echo(f"  ... and {len(series) - 20} more")
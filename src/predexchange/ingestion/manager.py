@@ -3,7 +3,9 @@
 from __future__ import annotations
 
 import asyncio
+import queue
 import signal
+import threading
 import time
 from pathlib import Path
 from typing import Any
@@ -12,11 +14,25 @@ import structlog
 
 from predexchange.ingestion.polymarket.ws import run_ws_ingestion
 from predexchange.storage.db import get_connection, init_schema
-from predexchange.storage.event_log import append_raw_events_batch, prepare_polymarket_rows
+from predexchange.storage.event_log import (
+    RawEventAppender,
+    append_raw_events_batch,
+    make_appender,
+    prepare_polymarket_rows,
+)
 from predexchange.storage.markets import get_tracked_asset_ids
 
 log = structlog.get_logger(__name__)
 
+# Flushed batches waiting for the writer thread. raw_events is the replay log, so nothing is ever
+# dropped: past this, batches wait in order and the WebSocket loop stops reading until there is room
+_WRITE_QUEUE_MAX_BATCHES = 1024
+# How often a blocked put rechecks whether the writer has failed
+_WRITE_PUT_POLL_SEC = 0.5
+# Attempts per batch before the writer gives up and stops ingestion
+_WRITE_ATTEMPTS = 3
+_WRITE_RETRY_DELAY_SEC = 0.5
+
 
 class IngestionManager:
     """Runs WebSocket ingestion and persists raw events to DuckDB."""
@@ -39,7 +55,15 @@ class IngestionManager:
         self.reconnect_max_retries = reconnect_max_retries
         self.orderbook_aggregator = orderbook_aggregator
         self._conn = None
-        self._batch: list[tuple[str, str, str, str, str | None, int | None, int, str]] = []
+        self._appender: RawEventAppender | None = None
+        self._write_queue: queue.Queue[list[tuple] | None] | None = None
+        self._writer: threading.Thread | None = None
+        self._write_error: BaseException | None = None
+        # Batches the full queue could not take yet, oldest first (see _wait_for_writer)
+        self._overflow: list[list[tuple]] = []
+        self._closing = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
         self._msg_count = 0
         self._start_ts: float | None = None
 
@@ -47,32 +71,91 @@ class IngestionManager:
         if self._conn is None:
             self._conn = get_connection(self.db_path)
             init_schema(self._conn)
+            # One writer thread owns the inserts, so the WebSocket loop never waits on DuckDB
+            self._write_queue = queue.Queue(maxsize=_WRITE_QUEUE_MAX_BATCHES)
+            self._writer = threading.Thread(target=self._write_batches, name="raw-events-writer", daemon=True)
+            self._writer.start()
+            self._appender = make_appender(self._conn, max_rows=self.event_batch_size, sink=self._enqueue_batch)
         return self._conn
 
-    def _flush_batch(self) -> None:
-        if not self._batch:
+    def _enqueue_batch(self, rows: list[tuple]) -> None:
+        """Appender sink: hand a flushed batch to the writer thread without blocking the event loop.
+        When the queue is full the batch is held in order for _wait_for_writer; it is never dropped."""
+        if self._closing:
+            # Loop is done: wait for room rather than hold batches nobody will drain
+            self._overflow.append(rows)
+            self._put_overflow()
             return
-        conn = self._get_conn()
-        append_raw_events_batch(conn, self._batch)
-        self._batch = []
-
-    def _on_message(self, payload: dict[str, Any] | list[Any], ingest_ts: int) -> None:
-        """Process one or more messages (server may send a list of events)."""
-        if isinstance(payload, list):
-            for item in payload:
-                if isinstance(item, dict):
-                    self._on_message_one(item, ingest_ts)
-        elif isinstance(payload, dict):
-            self._on_message_one(payload, ingest_ts)
-
-    def _on_message_one(self, payload: dict[str, Any], ingest_ts: int) -> None:
+        if not self._overflow:
+            try:
+                self._write_queue.put_nowait(rows)
+                return
+            except queue.Full:
+                log.warning("raw_events_writer_behind", queued_batches=_WRITE_QUEUE_MAX_BATCHES)
+        self._overflow.append(rows)
+
+    def _put_overflow(self) -> None:
+        """Move held batches onto the queue in order, blocking for room. Stops if the writer failed."""
+        while self._overflow and self._write_error is None:
+            try:
+                self._write_queue.put(self._overflow[0], timeout=_WRITE_PUT_POLL_SEC)
+            except queue.Full:
+                continue
+            self._overflow.pop(0)
+
+    async def _wait_for_writer(self) -> None:
+        """run_ws_ingestion batch hook: backpressure. Held batches are queued before the next frames
+        are read, waiting in an executor thread so the loop (pings, stop) keeps running."""
+        if self._overflow:
+            await asyncio.get_running_loop().run_in_executor(None, self._put_overflow)
+
+    def _write_batches(self) -> None:
+        """Writer thread: insert queued batches in order; batches that piled up go in as one insert."""
+        q = self._write_queue
+        done = False
+        while not done:
+            rows = q.get()
+            if rows is None:
+                break
+            while True:
+                try:
+                    more = q.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    done = True
+                    break
+                rows.extend(more)
+            for attempt in range(1, _WRITE_ATTEMPTS + 1):
+                try:
+                    append_raw_events_batch(self._conn, rows)
+                    break
+                except Exception as e:
+                    log.warning("raw_events_write_error", error=str(e), rows=len(rows), attempt=attempt)
+                    if attempt == _WRITE_ATTEMPTS:
+                        self._fail_writer(e)
+                        return
+                    time.sleep(_WRITE_RETRY_DELAY_SEC * attempt)
+
+    def _fail_writer(self, error: BaseException) -> None:
+        """Writer thread: record the error and stop ingestion; run() raises it."""
+        log.error("raw_events_writer_failed", error=str(error))
+        self._write_error = error
+        if self._loop is not None and self._stop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    def _flush_batch(self) -> None:
+        if self._appender is not None:
+            self._appender.flush()
+
+    def _on_message(self, payload: dict[str, Any], ingest_ts: int) -> None:
+        """Process one event dict (run_ws_ingestion already flattens array frames)."""
         self._msg_count += 1
         if self.orderbook_aggregator is not None:
             self.orderbook_aggregator.on_message(payload, ingest_ts)
-        for row in prepare_polymarket_rows(payload, ingest_ts):
-            self._batch.append(row)
-        if len(self._batch) >= self.event_batch_size:
-            self._flush_batch()
+        if self._appender is None:
+            self._get_conn()
+        self._appender.append_rows(prepare_polymarket_rows(payload, ingest_ts))
 
     async def run(self, stop_event: asyncio.Event | None = None) -> None:
         """Run ingestion until stop_event is set."""
@@ -83,6 +166,7 @@ class IngestionManager:
             return
         self._start_ts = time.time()
         stop = stop_event or asyncio.Event()
+        self._loop, self._stop = asyncio.get_running_loop(), stop
         await run_ws_ingestion(
             self.ws_url,
             asset_ids,
@@ -91,21 +175,35 @@ class IngestionManager:
             reconnect_max_delay_sec=self.reconnect_max_delay_sec,
             reconnect_max_retries=self.reconnect_max_retries,
             stop_event=stop,
+            after_batch=self._wait_for_writer,
         )
         self._flush_batch()
         log.info("ingestion_stopped", total_messages=self._msg_count)
+        if self._write_error is not None:
+            raise RuntimeError("raw_events writer failed; ingestion stopped") from self._write_error
 
     def get_status(self) -> dict[str, Any]:
-        """Return current status: msg_count, elapsed_sec, msgs_per_sec."""
+        """Return current status: msg_count, elapsed_sec, msgs_per_sec, pending_batches."""
         elapsed = (time.time() - self._start_ts) if self._start_ts else 0
         return {
             "msg_count": self._msg_count,
             "elapsed_sec": round(elapsed, 1),
             "msgs_per_sec": round(self._msg_count / elapsed, 2) if elapsed > 0 else 0,
+            "pending_batches": len(self._overflow),
         }
 
     def close(self) -> None:
+        self._closing = True
         self._flush_batch()
+        if self._write_queue is not None:
+            self._put_overflow()  # batches still held when run() returned
+        if self._writer is not None:
+            if self._writer.is_alive():
+                self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+            self._write_queue = None
         if self._conn is not None:
             self._conn.close()
             self._conn = None
+            self._appender = None
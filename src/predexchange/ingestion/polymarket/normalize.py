@@ -6,6 +6,7 @@ from typing import Any
 
 from predexchange.models.orderbook import OrderBookDelta, OrderBookSnapshot, PriceLevel
 from predexchange.models.trade import TradePrint
+from predexchange.simulation.fill_model import SIDE_IDX
 
 
 def _float(s: str | float | None) -> float:
@@ -17,6 +18,15 @@ def _float(s: str | float | None) -> float:
         return 0.0
 
 
+def _float_str(s: str) -> float:
+    """Hot-path float for WS book/price_change fields (sent as strings). Skips _float's None check;
+    float(None) raises TypeError, so missing or malformed values still map to 0.0."""
+    try:
+        return float(s)
+    except (TypeError, ValueError):
+        return 0.0
+
+
 def parse_book_message(payload: dict[str, Any]) -> OrderBookSnapshot | None:
     """Convert Polymarket 'book' message to OrderBookSnapshot. Uses 'bids'/'asks' or 'buys'/'sells'."""
     if payload.get("event_type") != "book":
@@ -30,7 +40,7 @@ def parse_book_message(payload: dict[str, Any]) -> OrderBookSnapshot | None:
     bids = []
     for lev in bids_raw:
         if isinstance(lev, dict):
-            p, s = _float(lev.get("price")), _float(lev.get("size"))
+            p, s = _float_str(lev.get("price")), _float_str(lev.get("size"))
         else:
             continue
         if 0 <= p <= 1 and s >= 0:
@@ -38,7 +48,7 @@ def parse_book_message(payload: dict[str, Any]) -> OrderBookSnapshot | None:
     asks = []
     for lev in asks_raw:
         if isinstance(lev, dict):
-            p, s = _float(lev.get("price")), _float(lev.get("size"))
+            p, s = _float_str(lev.get("price")), _float_str(lev.get("size"))
         else:
             continue
         if 0 <= p <= 1 and s >= 0:
@@ -77,25 +87,32 @@ def parse_price_change_message(payload: dict[str, Any]) -> list[OrderBookDelta]:
     for pc in changes:
         if not isinstance(pc, dict):
             continue
-        asset_id = str(pc.get("asset_id") or "")
-        side = (pc.get("side") or "BUY").upper()
-        if side not in ("BUY", "SELL"):
+        get = pc.get  # each needed field is looked up exactly once
+        side = get("side") or "BUY"
+        side_idx = SIDE_IDX.get(side)
+        if side_idx is None:
+            side = side.upper()
+            side_idx = SIDE_IDX.get(side)
+            if side_idx is None:
+                continue
+        price = _float_str(get("price"))
+        size = _float_str(get("size"))
+        if not (0 <= price <= 1 and size >= 0):
             continue
-        price = _float(pc.get("price"))
-        size = _float(pc.get("size"))
-        best_bid = _float(pc.get("best_bid")) if pc.get("best_bid") is not None else None
-        best_ask = _float(pc.get("best_ask")) if pc.get("best_ask") is not None else None
+        # Fields are checked above; model_construct skips per-delta Pydantic validation on the hot path.
+        # Missing/zero best_bid/best_ask -> None (_float_str(None) is 0.0).
         out.append(
-            OrderBookDelta(
+            OrderBookDelta.model_construct(
                 market_id=market_id,
-                asset_id=asset_id,
+                asset_id=str(get("asset_id") or ""),
                 side=side,
+                side_idx=side_idx,
                 price=price,
                 size=size,
                 exchange_ts=exchange_ts,
                 ingest_ts=None,
-                best_bid=best_bid or None,
-                best_ask=best_ask or None,
+                best_bid=_float_str(get("best_bid")) or None,
+                best_ask=_float_str(get("best_ask")) or None,
             )
         )
     return out
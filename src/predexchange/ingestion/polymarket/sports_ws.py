@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import time
 from typing import Any, Callable
 
 import structlog
 import websockets
 
+from predexchange.utils._json import JSONDecodeError, loads
+
 log = structlog.get_logger(__name__)
 
 SPORTS_WS_URL = "wss://sports-api.polymarket.com/ws"
@@ -17,8 +18,8 @@ SPORTS_WS_URL = "wss://sports-api.polymarket.com/ws"
 
 def _parse_message(raw: str) -> dict[str, Any] | None:
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads(raw)
+    except JSONDecodeError:
         return None
 
 
@@ -55,7 +56,7 @@ async def run_sports_ws(
                     if raw == "ping":
                         await ws.send("pong")
                         continue
-                    ingest_ts = int(time.time() * 1000)
+                    ingest_ts = time.time_ns() // 1_000_000
                     msg = _parse_message(raw)
                     if msg is not None and isinstance(msg, dict) and "gameId" in msg:
                         on_message(msg, ingest_ts)
@@ -3,24 +3,40 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import time
-from typing import Any, AsyncIterator, Callable
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable
 
 import structlog
 import websockets
 from websockets.asyncio.client import ClientConnection
 
+from predexchange.utils._json import JSONDecodeError, dumps, loads
+
+if TYPE_CHECKING:
+    from predexchange.metrics.live import UpdateRateCounter
+
 log = structlog.get_logger(__name__)
 
 
-def _parse_message(raw: str) -> dict[str, Any] | None:
+def _parse_message(raw: str | bytes) -> dict[str, Any] | list[Any] | None:
     try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
+        return loads(raw)
+    except JSONDecodeError:
         return None
 
 
+async def _drain_ready(ws: ClientConnection, batch: list[bytes], limit: int = 256) -> None:
+    """Append frames the connection has already buffered, without waiting on the network.
+    recv() returns without suspending when a frame is queued; otherwise the zero timeout cancels it,
+    which websockets guarantees is safe (no frame is lost)."""
+    while len(batch) < limit:
+        try:
+            async with asyncio.timeout(0):
+                batch.append(await ws.recv(decode=False))
+        except TimeoutError:
+            return
+
+
 async def run_ws_ingestion(
     ws_url: str,
     asset_ids: list[str],
@@ -30,15 +46,22 @@ async def run_ws_ingestion(
     reconnect_max_delay_sec: float = 60.0,
     reconnect_max_retries: int = 0,
     stop_event: asyncio.Event | None = None,
+    after_batch: Callable[[], Awaitable[None]] | None = None,
 ) -> None:
     """
     Connect to Polymarket CLOB WebSocket, subscribe to asset_ids, and call on_message for each message.
-    on_message(payload_dict, ingest_ts_ms). Runs until stop_event is set or connection fails permanently.
+    on_message(payload_dict, ingest_ts_ms); array frames are flattened to one call per event dict.
+    Frames already buffered by the connection are drained and handled as one batch (same ingest_ts).
+    after_batch, if given, is awaited after each batch before reading on (consumer backpressure).
+    Runs until stop_event is set or connection fails permanently.
     Reconnect with exponential backoff; resubscribe on each reconnect.
     """
     stop = stop_event or asyncio.Event()
     delay = reconnect_base_delay_sec
     retries = 0
+    # Subscribe to market channel (Polymarket docs: type "market", assets_ids).
+    # Serialized once; every reconnect resends the same text frame.
+    sub_msg = dumps({"type": "market", "assets_ids": asset_ids})
 
     while not stop.is_set():
         try:
@@ -52,23 +75,25 @@ async def run_ws_ingestion(
                 retries = 0
                 log.info("ws_connected", url=ws_url, asset_count=len(asset_ids))
 
-                # Subscribe to market channel (Polymarket docs: type "market", assets_ids)
-                sub = {"type": "market", "assets_ids": asset_ids}
-                await ws.send(json.dumps(sub))
+                await ws.send(sub_msg)
                 log.info("ws_subscribed", assets=len(asset_ids))
 
                 while not stop.is_set():
-                    raw = await asyncio.wait_for(ws.recv(), timeout=30.0)
-                    ingest_ts = int(time.time() * 1000)
-                    msg = _parse_message(raw)
-                    if msg is not None:
-                        # Server may send a single object or an array of events
-                        if isinstance(msg, list):
+                    # decode=False hands frames over as bytes; the parser reads them directly
+                    batch = [await asyncio.wait_for(ws.recv(decode=False), timeout=30.0)]
+                    await _drain_ready(ws, batch)
+                    ingest_ts = time.time_ns() // 1_000_000
+                    for raw in batch:
+                        msg = _parse_message(raw)
+                        # Server may send a single object or an array of events; on_message only sees dicts
+                        if isinstance(msg, dict):
+                            on_message(msg, ingest_ts)
+                        elif isinstance(msg, list):
                             for item in msg:
                                 if isinstance(item, dict):
                                     on_message(item, ingest_ts)
-                        else:
-                            on_message(msg, ingest_ts)
+                    if after_batch is not None:
+                        await after_batch()
         except asyncio.CancelledError:
             log.info("ws_cancelled")
             break
@@ -90,19 +115,29 @@ async def stream_events(
     *,
     reconnect_base_delay_sec: float = 1.0,
     reconnect_max_delay_sec: float = 60.0,
+    max_queue: int = 10_000,
+    drop_counter: UpdateRateCounter | None = None,
 ) -> AsyncIterator[tuple[dict[str, Any], int]]:
     """
     Async generator that yields (payload_dict, ingest_ts_ms) for each WebSocket message.
     Reconnects and resubscribes on disconnect.
+    At most max_queue events are buffered; if the consumer falls behind, the oldest buffered
+    event is dropped (fresh book state beats stale deltas) and drop_counter, if given, is hit.
     """
-    queue: asyncio.Queue[tuple[dict[str, Any], int] | None] = asyncio.Queue()
+    queue: asyncio.Queue[tuple[dict[str, Any], int] | None] = asyncio.Queue(maxsize=max_queue)
     sentinel = None
 
-    def on_message(msg: dict[str, Any], ingest_ts: int) -> None:
+    def put_dropping_oldest(item: tuple[dict[str, Any], int] | None) -> None:
         try:
-            queue.put_nowait((msg, ingest_ts))
+            queue.put_nowait(item)
         except asyncio.QueueFull:
-            pass
+            queue.get_nowait()
+            queue.put_nowait(item)
+            if drop_counter is not None:
+                drop_counter.hit()
+
+    def on_message(msg: dict[str, Any], ingest_ts: int) -> None:
+        put_dropping_oldest((msg, ingest_ts))
 
     async def run() -> None:
         await run_ws_ingestion(
@@ -112,7 +147,7 @@ async def stream_events(
             reconnect_base_delay_sec=reconnect_base_delay_sec,
             reconnect_max_delay_sec=reconnect_max_delay_sec,
         )
-        queue.put_nowait(sentinel)
+        put_dropping_oldest(sentinel)
 
     task = asyncio.create_task(run())
     try:
@@ -6,6 +6,8 @@ import time
 from collections import deque
 from typing import TYPE_CHECKING
 
+import numpy as np
+
 if TYPE_CHECKING:
     from predexchange.orderbook.engine import OrderBookEngine
 
@@ -26,15 +28,46 @@ def spread_pct(engine: OrderBookEngine) -> float | None:
 
 def imbalance(engine: OrderBookEngine, levels: int = 5) -> float | None:
     """Orderbook imbalance: (bid_volume - ask_volume) / (bid_volume + ask_volume) over top N levels. [-1, 1]."""
-    bid_list, ask_list = engine.depth_at_levels(n=levels)
-    bid_vol = sum(s for _, s in bid_list)
-    ask_vol = sum(s for _, s in ask_list)
+    bid_vol, ask_vol = engine.top_volumes(n=levels)
     total = bid_vol + ask_vol
     if total == 0:
         return None
     return (bid_vol - ask_vol) / total
 
 
+def compute_snapshot_metrics(
+    bids: np.ndarray, asks: np.ndarray, levels: int = 5
+) -> tuple[float | None, float | None, float | None, float | None, float | None]:
+    """
+    (best_bid, best_ask, mid, spread, imbalance) for one book given as (n, 2) [price, size] arrays
+    in any order; imbalance is over the top `levels` per side, as in imbalance(). Missing -> None.
+    """
+    bids = np.asarray(bids, dtype=np.float64).reshape(-1, 2)
+    asks = np.asarray(asks, dtype=np.float64).reshape(-1, 2)
+    bb = float(bids[:, 0].max()) if bids.shape[0] else None
+    ba = float(asks[:, 0].min()) if asks.shape[0] else None
+    mid = spread = None
+    if bb is not None and ba is not None:
+        mid = (bb + ba) / 2.0
+        spread = ba - bb
+    bid_vol = _top_volume(bids, levels, best_high=True)
+    ask_vol = _top_volume(asks, levels, best_high=False)
+    total = bid_vol + ask_vol
+    imb = (bid_vol - ask_vol) / total if total != 0 else None
+    return bb, ba, mid, spread, imb
+
+
+def _top_volume(side: np.ndarray, levels: int, best_high: bool) -> float:
+    """Summed size of the `levels` best-priced rows (argpartition, no full sort)."""
+    n = side.shape[0]
+    if n <= levels:
+        return float(side[:, 1].sum())
+    if levels <= 0:
+        return 0.0
+    key = -side[:, 0] if best_high else side[:, 0]
+    return float(side[np.argpartition(key, levels - 1)[:levels], 1].sum())
+
+
 def depth_at_levels(engine: OrderBookEngine, n: int = 5) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
     """Top N bid and ask levels (price, size)."""
     return engine.depth_at_levels(n=n)
@@ -44,28 +77,46 @@ class MidPriceSeries:
     """Rolling mid-price history for volatility proxy and sparkline."""
 
     def __init__(self, maxlen: int = 100) -> None:
-        self._times: deque[float] = deque(maxlen=maxlen)
-        self._prices: deque[float] = deque(maxlen=maxlen)
+        # Preallocated ring buffers; _head is the next write slot, _count the number of valid points.
+        self._maxlen = maxlen
+        self._times = np.empty(maxlen, dtype=np.float64)
+        self._prices = np.empty(maxlen, dtype=np.float64)
+        self._head = 0
+        self._count = 0
 
     def push(self, ts: float, price: float) -> None:
-        self._times.append(ts)
-        self._prices.append(price)
+        if not self._maxlen:
+            return  # maxlen=0 keeps nothing, like deque(maxlen=0)
+        self._times[self._head] = ts
+        self._prices[self._head] = price
+        self._head = (self._head + 1) % self._maxlen
+        if self._count < self._maxlen:
+            self._count += 1
+
+    def _valid(self) -> tuple[np.ndarray, np.ndarray]:
+        """Filled slots of both buffers (unordered once the ring has wrapped)."""
+        n = self._count
+        return self._times[:n], self._prices[:n]
 
     def volatility_proxy(self, window_sec: float = 60.0) -> float | None:
         """Std dev of mid price over the last window_sec seconds (if enough points)."""
-        if len(self._prices) < 2:
+        if self._count < 2:
             return None
-        now = time.time()
-        cutoff = now - window_sec
-        prices = [p for t, p in zip(self._times, self._prices) if t >= cutoff]
-        if len(prices) < 2:
+        cutoff = time.time() - window_sec
+        times, prices = self._valid()
+        prices = prices[times >= cutoff]
+        if prices.size < 2:
             return None
-        mean = sum(prices) / len(prices)
-        var = sum((p - mean) ** 2 for p in prices) / (len(prices) - 1)
-        return var ** 0.5
+        return float(np.std(prices, ddof=1))
 
     def series(self) -> list[tuple[float, float]]:
-        return list(zip(self._times, self._prices))
+        """Points oldest-first as (ts, price)."""
+        if self._count < self._maxlen:
+            times, prices = self._valid()
+        else:
+            times = np.roll(self._times, -self._head)
+            prices = np.roll(self._prices, -self._head)
+        return list(zip(times.tolist(), prices.tolist()))
 
 
 class UpdateRateCounter:
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class PriceLevel(BaseModel):
@@ -31,6 +31,7 @@ class OrderBookDelta(BaseModel):
     asset_id: str
     venue: str = "polymarket"
     side: str = Field(..., pattern="^(BUY|SELL)$")
+    side_idx: int = Field(0, ge=0, le=1)  # 0 = BUY (bids), 1 = SELL (asks); derived from side
     price: float = Field(..., ge=0, le=1)
     size: float = Field(..., ge=0)
     exchange_ts: int | None = None
@@ -38,3 +39,8 @@ class OrderBookDelta(BaseModel):
     # Optional best bid/ask after this change (for validation)
     best_bid: float | None = None
     best_ask: float | None = None
+
+    @model_validator(mode="after")
+    def _derive_side_idx(self) -> OrderBookDelta:
+        self.side_idx = 0 if self.side == "BUY" else 1
+        return self
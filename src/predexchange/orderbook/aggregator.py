@@ -17,6 +17,9 @@ class OrderBookAggregator:
     def __init__(self, use_rust: bool = True) -> None:
         self._engines: dict[tuple[str, str], OrderBookEngine] = {}
         self._use_rust = use_rust
+        self._rev = 0
+        # Engines that have received a book snapshot, in first-snapshot order
+        self._live: dict[tuple[str, str], OrderBookEngine] = {}
 
     def _engine(self, market_id: str, asset_id: str) -> OrderBookEngine:
         key = (market_id, asset_id)
@@ -33,14 +36,26 @@ class OrderBookAggregator:
                 eng = self._engine(snap.market_id, snap.asset_id)
                 snap.ingest_ts = ingest_ts
                 eng.apply_snapshot(snap)
+                self._live[(snap.market_id, snap.asset_id)] = eng
+                self._rev += 1
         elif event_type == "price_change":
             for delta in parse_price_change_message(payload):
                 delta.ingest_ts = ingest_ts
                 eng = self._engine(delta.market_id, delta.asset_id)
                 eng.apply_delta(delta)
+                self._rev += 1
+
+    @property
+    def revision(self) -> int:
+        """Bumped on every applied snapshot/delta; unchanged means no book moved."""
+        return self._rev
 
     def get_engine(self, market_id: str, asset_id: str) -> OrderBookEngine | None:
         return self._engines.get((market_id, asset_id))
 
     def engines(self) -> dict[tuple[str, str], OrderBookEngine]:
         return dict(self._engines)
+
+    def live_engines(self) -> dict[tuple[str, str], OrderBookEngine]:
+        """Engines with a book snapshot (has_snapshot), without scanning ones still waiting for one."""
+        return dict(self._live)
@@ -5,11 +5,26 @@ from __future__ import annotations
 from typing import Any
 
 import structlog
+from sortedcontainers import SortedDict
 
 from predexchange.models.orderbook import OrderBookDelta, OrderBookSnapshot, PriceLevel
 
 log = structlog.get_logger(__name__)
 
+# SortedDict.__setitem__ re-checks membership to keep its key list sorted; for a level that is
+# already in the book only the value changes, so the plain dict store is enough.
+_dict_set = dict.__setitem__
+
+# Book levels are keyed by integer ticks of 1e-6 (same scale as the Rust core): int hashing is
+# cheaper than float, and keys can't drift the way float prices from different sources can.
+PRICE_SCALE = 1_000_000
+
+
+def price_to_key(price: float) -> int:
+    """Nearest integer tick for a price in [0, 1]."""
+    return int(price * PRICE_SCALE + 0.5)
+
+
 try:
     from predexchange_core import OrderbookEngine as _RustEngine
     _RUST_AVAILABLE = True
@@ -19,7 +34,7 @@ except ImportError:
 
 
 def create_orderbook_engine(market_id: str, asset_id: str, use_rust: bool = True) -> OrderBookEngine:
-    """Create an engine. use_rust=False forces Python (needed for depth/heatmap chart replay)."""
+    """Create an engine. Uses the Rust core when built, unless use_rust=False."""
     if use_rust and _RUST_AVAILABLE and _RustEngine is not None:
         return _RustOrderbookEngineAdapter(market_id, asset_id)
     return OrderBookEngine(market_id, asset_id)
@@ -33,6 +48,7 @@ class _RustOrderbookEngineAdapter:
         self.market_id = market_id
         self.asset_id = asset_id
         self._inconsistent = False
+        self._depth_n = 0
 
     def apply_snapshot(self, snapshot: OrderBookSnapshot) -> None:
         if snapshot.market_id != self.market_id or snapshot.asset_id != self.asset_id:
@@ -42,13 +58,13 @@ class _RustOrderbookEngineAdapter:
         self._rust.apply_snapshot(bids, asks)
         self._inconsistent = False
 
-    def apply_delta(self, delta: OrderBookDelta) -> None:
+    def apply_delta(self, delta: OrderBookDelta) -> float:
         if delta.market_id != self.market_id or delta.asset_id != self.asset_id:
-            return
+            return 0.0
         if delta.size < 0:
             self._inconsistent = True
-            return
-        self._rust.apply_delta(delta.side, delta.price, delta.size)
+            return 0.0
+        return self._rust.apply_delta_returning_prev_size(delta.side, delta.price, delta.size)
 
     @property
     def best_bid(self) -> float | None:
@@ -100,52 +116,98 @@ class _RustOrderbookEngineAdapter:
         )
 
     def depth_at_levels(self, n: int = 5) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
-        return ([], [])  # Rust doesn't expose depth; TUI will show best only when using Rust
+        return self._rust.depth_at_levels(n)
+
+    def top_volumes(self, n: int = 5) -> tuple[float, float]:
+        return self._rust.top_volumes(n)
+
+    def track_depth(self, n: int) -> None:
+        self._depth_n = n
+
+    @property
+    def depth_sums(self) -> tuple[float, float]:
+        # BTreeMap walks the top N directly, so Rust needs no running sums
+        return self._rust.top_volumes(self._depth_n) if self._depth_n else (0.0, 0.0)
+
+    def bids_in_range(self, lo: float, hi: float) -> list[tuple[float, float]]:
+        return self._rust.bids_in_range(lo, hi)
+
+    def asks_in_range(self, lo: float, hi: float) -> list[tuple[float, float]]:
+        return self._rust.asks_in_range(lo, hi)
 
 
 class OrderBookEngine:
     """In-memory L2 orderbook per market/asset. Deterministic application of snapshot and deltas."""
 
-    __slots__ = ("market_id", "asset_id", "bids", "asks", "_has_snapshot", "_inconsistent", "_warned_delta_before_snapshot")
+    __slots__ = (
+        "market_id", "asset_id", "bids", "asks", "_sides", "_has_snapshot", "_inconsistent",
+        "_warned_delta_before_snapshot", "_depth_n", "_depth_sums", "_best",
+    )
 
     def __init__(self, market_id: str, asset_id: str) -> None:
         self.market_id = market_id
         self.asset_id = asset_id
-        # price -> size (bids: higher is better, asks: lower is better)
-        self.bids: dict[float, float] = {}
-        self.asks: dict[float, float] = {}
+        # price tick (see PRICE_SCALE) -> size, kept sorted ascending (bids: best is last, asks: best is first)
+        self.bids: SortedDict = SortedDict()
+        self.asks: SortedDict = SortedDict()
+        # Indexed by OrderBookDelta.side_idx; the books are mutated in place, never rebound
+        self._sides = (self.bids, self.asks)
         self._has_snapshot = False
         self._inconsistent = False
         self._warned_delta_before_snapshot = False
+        # Running top-N size sums per side (see track_depth); 0 = not tracked
+        self._depth_n = 0
+        self._depth_sums = [0.0, 0.0]
+        # Best tick per side (bid, ask), kept current by apply_*; None when the side is empty
+        self._best: list[int | None] = [None, None]
+
+    def track_depth(self, n: int) -> None:
+        """Maintain running (bid, ask) size sums over the top n levels, read via depth_sums."""
+        self._depth_n = n
+        self._depth_sums[:] = self.top_volumes(n) if n > 0 else (0.0, 0.0)
+
+    @property
+    def depth_sums(self) -> tuple[float, float]:
+        """(bid, ask) size sums over the tracked top-N levels, without touching the books."""
+        if not self._depth_n:
+            return (0.0, 0.0)
+        return (self._depth_sums[0], self._depth_sums[1])
 
     def apply_snapshot(self, snapshot: OrderBookSnapshot) -> None:
         """Replace book with snapshot. Validates non-negative sizes."""
         if snapshot.market_id != self.market_id or snapshot.asset_id != self.asset_id:
             log.warning("orderbook_mismatch", expected=(self.market_id, self.asset_id), got=(snapshot.market_id, snapshot.asset_id))
             return
-        self.bids = {}
-        self.asks = {}
+        self.bids.clear()
+        self.asks.clear()
         for lev in snapshot.bids:
             if lev.size < 0:
                 self._inconsistent = True
                 log.warning("orderbook_negative_bid", price=lev.price, size=lev.size)
                 continue
             if lev.size > 0:
-                self.bids[lev.price] = lev.size
+                self.bids[int(lev.price * PRICE_SCALE + 0.5)] = lev.size
         for lev in snapshot.asks:
             if lev.size < 0:
                 self._inconsistent = True
                 log.warning("orderbook_negative_ask", price=lev.price, size=lev.size)
                 continue
             if lev.size > 0:
-                self.asks[lev.price] = lev.size
+                self.asks[int(lev.price * PRICE_SCALE + 0.5)] = lev.size
         self._has_snapshot = True
         self._inconsistent = False
+        self._best[0] = self.bids.peekitem(-1)[0] if self.bids else None
+        self._best[1] = self.asks.peekitem(0)[0] if self.asks else None
+        if self._depth_n:
+            self._depth_sums[:] = self.top_volumes(self._depth_n)
+
+    def apply_delta(self, delta: OrderBookDelta) -> float:
+        """Apply a single price level update. If size is 0, remove the level.
 
-    def apply_delta(self, delta: OrderBookDelta) -> None:
-        """Apply a single price level update. If size is 0, remove the level."""
+        Returns the size previously at that level (0.0 if none or the delta was ignored).
+        """
         if delta.market_id != self.market_id or delta.asset_id != self.asset_id:
-            return
+            return 0.0
         if not self._has_snapshot:
             if not self._warned_delta_before_snapshot:
                 self._warned_delta_before_snapshot = True
@@ -156,25 +218,78 @@ class OrderBookEngine:
                     msg="Deltas before first book snapshot (normal at startup); later deltas suppressed.",
                 )
             self._inconsistent = True
-            return
-        side = self.bids if delta.side == "BUY" else self.asks
-        if delta.size < 0:
+            return 0.0
+        idx = delta.side_idx
+        side = self._sides[idx]
+        size = delta.size
+        if size < 0:
             self._inconsistent = True
-            log.warning("orderbook_negative_delta", side=delta.side, price=delta.price, size=delta.size)
-            return
-        price = round(delta.price, 6)
-        if delta.size == 0:
-            side.pop(price, None)
+            log.warning("orderbook_negative_delta", side=delta.side, price=delta.price, size=size)
+            return 0.0
+        key = int(delta.price * PRICE_SCALE + 0.5)
+        best = self._best
+        if size == 0:
+            prev = self._apply_tracked(idx, key, size) if self._depth_n else side.pop(key, 0.0)
+            if key == best[idx]:
+                # peekitem(idx - 1): last key for bids (idx 0), first key for asks (idx 1)
+                best[idx] = side.peekitem(idx - 1)[0] if side else None
+            return prev
+        if self._depth_n:
+            prev = self._apply_tracked(idx, key, size)
         else:
-            side[price] = delta.size
+            prev = side.get(key)
+            if prev is None:
+                side[key] = size
+                prev = 0.0
+            else:
+                _dict_set(side, key, size)
+        b = best[idx]
+        if b is None or (key < b if idx else key > b):
+            best[idx] = key
+        return prev
+
+    def _apply_tracked(self, idx: int, key: int, size: float) -> float:
+        """apply_delta body when top-N sums are tracked. Ranks count from the best level (bids: last)."""
+        side = self._sides[idx]
+        sums = self._depth_sums
+        n = self._depth_n
+        prev = side.get(key)
+        if prev is None:
+            if size == 0:
+                return 0.0
+            side[key] = size
+            pos = side.bisect_left(key)
+            rank = pos if idx else len(side) - 1 - pos
+            if rank < n:
+                sums[idx] += size
+                if len(side) > n:
+                    # The old N-th level was pushed out of the top N
+                    sums[idx] -= side.peekitem(n if idx else len(side) - 1 - n)[1]
+            return 0.0
+        pos = side.bisect_left(key)
+        rank = pos if idx else len(side) - 1 - pos
+        if size == 0:
+            if rank < n:
+                sums[idx] -= prev
+                if len(side) > n:
+                    # The (N+1)-th level moves up into the top N once this one is gone
+                    sums[idx] += side.peekitem(n if idx else len(side) - 1 - n)[1]
+            del side[key]
+            return prev
+        _dict_set(side, key, size)
+        if rank < n:
+            sums[idx] += size - prev
+        return prev
 
     @property
     def best_bid(self) -> float | None:
-        return max(self.bids) if self.bids else None
+        b = self._best[0]
+        return b / PRICE_SCALE if b is not None else None
 
     @property
     def best_ask(self) -> float | None:
-        return min(self.asks) if self.asks else None
+        a = self._best[1]
+        return a / PRICE_SCALE if a is not None else None
 
     @property
     def mid_price(self) -> float | None:
@@ -200,8 +315,8 @@ class OrderBookEngine:
 
     def to_snapshot(self, exchange_ts: int | None = None, ingest_ts: int | None = None) -> OrderBookSnapshot:
         """Export current state as OrderBookSnapshot."""
-        bids = [PriceLevel(price=p, size=s) for p, s in sorted(self.bids.items(), reverse=True)]
-        asks = [PriceLevel(price=p, size=s) for p, s in sorted(self.asks.items())]
+        bids = [PriceLevel(price=k / PRICE_SCALE, size=s) for k, s in self.bids.items()[::-1]]
+        asks = [PriceLevel(price=k / PRICE_SCALE, size=s) for k, s in self.asks.items()]
         return OrderBookSnapshot(
             market_id=self.market_id,
             asset_id=self.asset_id,
@@ -212,7 +327,25 @@ class OrderBookEngine:
         )
 
     def depth_at_levels(self, n: int = 5) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
-        """Return (top N bids, top N asks) as [(price, size), ...]."""
-        bid_list = sorted(self.bids.items(), reverse=True)[:n]
-        ask_list = sorted(self.asks.items())[:n]
+        """Return (top N bids, top N asks) as [(price, size), ...]. Slices the sorted books, no re-sort."""
+        bids = self.bids
+        bid_list = [(k / PRICE_SCALE, s) for k, s in bids.items()[max(len(bids) - n, 0):][::-1]]
+        ask_list = [(k / PRICE_SCALE, s) for k, s in self.asks.items()[:n]]
         return (bid_list, ask_list)
+
+    def top_volumes(self, n: int = 5) -> tuple[float, float]:
+        """Return (bid size sum, ask size sum) over the top N levels without building level lists."""
+        bids = self.bids
+        bid_vol = sum(bids.values()[max(len(bids) - n, 0):])
+        ask_vol = sum(self.asks.values()[:n])
+        return (bid_vol, ask_vol)
+
+    def bids_in_range(self, lo: float, hi: float) -> list[tuple[float, float]]:
+        """Bid levels with lo <= price <= hi, ascending by price."""
+        bids = self.bids
+        return [(k / PRICE_SCALE, bids[k]) for k in bids.irange(price_to_key(lo), price_to_key(hi))]
+
+    def asks_in_range(self, lo: float, hi: float) -> list[tuple[float, float]]:
+        """Ask levels with lo <= price <= hi, ascending by price."""
+        asks = self.asks
+        return [(k / PRICE_SCALE, asks[k]) for k in asks.irange(price_to_key(lo), price_to_key(hi))]
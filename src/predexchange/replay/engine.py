@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
-import json
+import array
+import math
+from functools import lru_cache
 from typing import Any, Iterator
 
+import numpy as np
+
 from predexchange.ingestion.polymarket.normalize import (
     parse_book_message,
     parse_price_change_message,
 )
 from predexchange.orderbook.aggregator import OrderBookAggregator
+from predexchange.orderbook.engine import PRICE_SCALE, OrderBookEngine
+from predexchange.utils._json import JSONDecodeError, loads
+
+# Rows pulled from the cursor per round trip; keeps memory flat on long replays
+_FETCH_BATCH = 4096
 
 
 def _canonical_market_id(s: str) -> str:
@@ -20,33 +29,98 @@ def _canonical_market_id(s: str) -> str:
     return s.lower()
 
 
-def stream_raw_events(
-    conn: Any,
-    market_id: str | None = None,
-    start_ts: int | None = None,
-    end_ts: int | None = None,
-) -> Iterator[tuple[dict[str, Any], int]]:
-    """Yield (payload, ingest_ts) for raw_events, optionally filtered by market and time."""
+_STREAM_SELECT = "SELECT payload, ingest_ts"
+_BUCKETED_SELECT = (
+    "SELECT (ingest_ts // ?) * ? AS ts_bucket, ingest_ts, "
+    "CASE WHEN asset_id = ? AND event_type IN ('book', 'price_change') THEN payload END"
+)
+
+
+def _raw_events_where(has_market: bool, has_start: bool, has_end: bool) -> str:
     conditions = []
-    params = []
+    if has_market:
+        # market_key is generated as LOWER(REPLACE(TRIM(market_id), '0x', '')) (see storage.db)
+        conditions.append("market_key = ?")
+    if has_start:
+        conditions.append("ingest_ts >= ?")
+    if has_end:
+        conditions.append("ingest_ts <= ?")
+    return " AND ".join(conditions) if conditions else "1=1"
+
+
+@lru_cache(maxsize=32)
+def _raw_events_sql(select: str, has_market: bool, has_start: bool, has_end: bool) -> str:
+    """Full raw_events query for one filter shape. Only the shape varies between calls (values are
+    bound), so sweeps and repeated chart requests reuse the same string."""
+    where = _raw_events_where(has_market, has_start, has_end)
+    return f"{select} FROM raw_events WHERE {where} ORDER BY id ASC"
+
+
+def _raw_events_query(
+    select: str,
+    market_id: str | None,
+    start_ts: int | None,
+    end_ts: int | None,
+) -> tuple[str, list[Any]]:
+    """(sql, filter params) for raw_events filtered by market and ingest_ts window."""
+    params: list[Any] = []
     if market_id:
-        conditions.append("LOWER(REPLACE(TRIM(market_id), '0x', '')) = ?")
         params.append(_canonical_market_id(market_id))
     if start_ts is not None:
-        conditions.append("ingest_ts >= ?")
         params.append(start_ts)
     if end_ts is not None:
-        conditions.append("ingest_ts <= ?")
         params.append(end_ts)
-    where = " AND ".join(conditions) if conditions else "1=1"
-    sql = f"SELECT payload, ingest_ts FROM raw_events WHERE {where} ORDER BY id ASC"
-    rows = conn.execute(sql, params).fetchall()
-    for payload_json, ingest_ts in rows:
-        try:
-            payload = json.loads(payload_json) if isinstance(payload_json, str) else payload_json
-        except (TypeError, json.JSONDecodeError):
-            continue
-        yield (payload, ingest_ts)
+    sql = _raw_events_sql(select, bool(market_id), start_ts is not None, end_ts is not None)
+    return sql, params
+
+
+def stream_raw_events(
+    conn: Any,
+    market_id: str | None = None,
+    start_ts: int | None = None,
+    end_ts: int | None = None,
+) -> Iterator[tuple[dict[str, Any], int]]:
+    """Yield (payload, ingest_ts) for raw_events, optionally filtered by market and time."""
+    sql, params = _raw_events_query(_STREAM_SELECT, market_id, start_ts, end_ts)
+    cur = conn.execute(sql, params)
+    while batch := cur.fetchmany(_FETCH_BATCH):
+        for payload_json, ingest_ts in batch:
+            if isinstance(payload_json, dict):
+                yield (payload_json, ingest_ts)
+                continue
+            try:
+                payload = loads(payload_json)
+            except (TypeError, JSONDecodeError):
+                continue
+            yield (payload, ingest_ts)
+
+
+def _stream_bucketed_asset_events(
+    conn: Any,
+    market_id: str,
+    asset_id: str,
+    start_ts: int | None,
+    end_ts: int | None,
+    bucket_ms: int,
+) -> Iterator[tuple[int, int, dict[str, Any] | None]]:
+    """
+    Yield (ts_bucket, ingest_ts, payload) for every raw event of the market in the window, in log order.
+    Bucketing and asset filtering run in DuckDB: payload is only fetched and decoded for book /
+    price_change rows of asset_id (price_change rows are stored once per asset they touch),
+    and is None for every other event, which only marks its bucket as active.
+    """
+    sql, params = _raw_events_query(_BUCKETED_SELECT, market_id, start_ts, end_ts)
+    cur = conn.execute(sql, [bucket_ms, bucket_ms, asset_id, *params])
+    while batch := cur.fetchmany(_FETCH_BATCH):
+        for ts_bucket, ingest_ts, payload_json in batch:
+            if payload_json is None:
+                yield (ts_bucket, ingest_ts, None)
+                continue
+            try:
+                payload = loads(payload_json)
+            except (TypeError, JSONDecodeError):
+                payload = None
+            yield (ts_bucket, ingest_ts, payload)
 
 
 def replay_events(
@@ -57,8 +131,108 @@ def replay_events(
     end_ts: int | None = None,
 ) -> None:
     """Replay events into the aggregator (deterministic). No timing/speed - just apply in order."""
+    on_message = aggregator.on_message
     for payload, ingest_ts in stream_raw_events(conn, market_id=market_id, start_ts=start_ts, end_ts=end_ts):
-        aggregator.on_message(payload, ingest_ts)
+        on_message(payload, ingest_ts)
+
+
+class MidSeries:
+    """Replayed mid prices as parallel typed columns: ts (int64 ms) and mid (float64, NaN = no mid)."""
+
+    __slots__ = ("ts", "mid")
+
+    def __init__(self) -> None:
+        self.ts = array.array("q")
+        self.mid = array.array("d")
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray]:
+        """(ts int64, mid float64) NumPy views over the columns (no copy; NaN = no mid). The series
+        cannot grow while a view is alive."""
+        return (np.frombuffer(self.ts, dtype=np.int64), np.frombuffer(self.mid, dtype=np.float64))
+
+    def points(self, step: int = 1) -> Iterator[tuple[int, float | None]]:
+        """Yield (ts, mid or None) for every step-th point."""
+        for t, m in zip(self.ts[::step], self.mid[::step]):
+            yield (t, None if m != m else m)
+
+
+# Book-only replay as one query. Mirrors parse_book_message + OrderBookEngine.apply_snapshot:
+# levels with 0 <= price <= 1 and size > 0, prices on the PRICE_SCALE tick grid, mid = (bb + ba) / 2
+# or the one side present. A book of asset_id sets the mid of engine (payload market, asset_id)
+# (NaN = snapshot without a mid); every event reports the last mid of its payload market's engine.
+_BOOK_LEVELS_SQL = """
+list_filter(
+    list_transform(
+        TRY_CAST(CASE WHEN json_array_length(payload, '$.{side}') > 0
+                      THEN json_extract(payload, '$.{side}') ELSE json_extract(payload, '$.{alt}') END
+                 AS JSON[]),
+        x -> {{'p': COALESCE(TRY_CAST(x->>'price' AS DOUBLE), 0.0), 's': TRY_CAST(x->>'size' AS DOUBLE)}}),
+    l -> l.p >= 0 AND l.p <= 1 AND l.s > 0)
+"""
+_MID_SERIES_CTE = f"""
+WITH ev AS (
+    SELECT id, ingest_ts,
+           COALESCE(NULLIF(payload->>'market', ''), NULLIF(payload->>'market_id', ''), ?) AS engine_market,
+           event_type = 'book' AND asset_id = ?
+               AND COALESCE(NULLIF(payload->>'market', ''), NULLIF(payload->>'market_id', '')) IS NOT NULL
+               AS is_book,
+           CASE WHEN is_book THEN {_BOOK_LEVELS_SQL.format(side="bids", alt="buys")} END AS bids,
+           CASE WHEN is_book THEN {_BOOK_LEVELS_SQL.format(side="asks", alt="sells")} END AS asks
+    FROM raw_events
+    WHERE {{where}}
+), tops AS (
+    SELECT id, ingest_ts, engine_market, is_book,
+           list_max(list_transform(bids, l -> floor(l.p * {PRICE_SCALE}.0 + 0.5))) / {PRICE_SCALE} AS bb,
+           list_min(list_transform(asks, l -> floor(l.p * {PRICE_SCALE}.0 + 0.5))) / {PRICE_SCALE} AS ba
+    FROM ev
+), books AS (
+    SELECT id, ingest_ts, engine_market,
+           CASE WHEN is_book THEN COALESCE(
+               CASE WHEN bb IS NOT NULL AND ba IS NOT NULL THEN (bb + ba) / 2.0 WHEN bb <> 0 THEN bb ELSE ba END,
+               'NaN'::DOUBLE) END AS book_mid
+    FROM tops
+)
+SELECT ingest_ts,
+       COALESCE(last_value(book_mid IGNORE NULLS) OVER (
+           PARTITION BY engine_market ORDER BY id ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW
+       ), 'NaN'::DOUBLE) AS mid
+FROM books
+ORDER BY id
+"""
+
+
+@lru_cache(maxsize=8)
+def _mid_series_sql(has_market: bool, has_start: bool, has_end: bool) -> str:
+    return _MID_SERIES_CTE.replace("{where}", _raw_events_where(has_market, has_start, has_end))
+
+
+def _has_price_changes(conn: Any, market_id: str, start_ts: int | None, end_ts: int | None) -> bool:
+    sql, params = _raw_events_query("SELECT id", market_id, start_ts, end_ts)
+    sql = sql.replace(" ORDER BY id ASC", " AND event_type = 'price_change' LIMIT 1")
+    return conn.execute(sql, params).fetchone() is not None
+
+
+def replay_to_mid_series_sql(
+    conn: Any,
+    market_id: str,
+    asset_id: str,
+    start_ts: int | None = None,
+    end_ts: int | None = None,
+) -> MidSeries:
+    """
+    replay_to_mid_series for a window holding only book snapshots (no price_change deltas), computed
+    in one DuckDB query: no payload is decoded or applied in Python.
+    """
+    _, params = _raw_events_query("", market_id, start_ts, end_ts)
+    sql = _mid_series_sql(bool(market_id), start_ts is not None, end_ts is not None)
+    cols = conn.execute(sql, [market_id, asset_id, *params]).fetchnumpy()
+    out = MidSeries()
+    out.ts.frombytes(np.ascontiguousarray(cols["ingest_ts"], dtype=np.int64).tobytes())
+    out.mid.frombytes(np.ascontiguousarray(cols["mid"], dtype=np.float64).tobytes())
+    return out
 
 
 def replay_to_mid_series(
@@ -67,20 +241,32 @@ def replay_to_mid_series(
     asset_id: str,
     start_ts: int | None = None,
     end_ts: int | None = None,
-) -> list[tuple[int, float | None]]:
+) -> MidSeries:
     """
-    Replay and return [(ingest_ts, mid_price), ...] for the given market/asset.
-    Deterministic: same DB + params -> same output.
+    Replay and return the (ingest_ts, mid_price) series for the given market/asset, one point per event.
+    Deterministic: same DB + params -> same output. Book-only windows take replay_to_mid_series_sql.
     """
+    if not _has_price_changes(conn, market_id, start_ts, end_ts):
+        return replay_to_mid_series_sql(conn, market_id, asset_id, start_ts=start_ts, end_ts=end_ts)
     aggregator = OrderBookAggregator()
-    out: list[tuple[int, float | None]] = []
+    out = MidSeries()
+    ts_append, mid_append = out.ts.append, out.mid.append
+    nan = math.nan
+    on_message, get_engine = aggregator.on_message, aggregator.get_engine
+    eng: OrderBookEngine | None = None
+    eng_market: Any = None
     for payload, ingest_ts in stream_raw_events(conn, market_id=market_id, start_ts=start_ts, end_ts=end_ts):
-        aggregator.on_message(payload, ingest_ts)
-        # Engine is keyed by market_id from payload (e.g. 0x...) not request (e.g. no 0x)
-        payload_market = str(payload.get("market") or payload.get("market_id") or market_id)
-        eng = aggregator.get_engine(payload_market, asset_id)
+        on_message(payload, ingest_ts)
+        # Engine is keyed by market_id from payload (e.g. 0x...) not request (e.g. no 0x).
+        # Engines are never replaced, so the handle is only re-resolved when the payload's market changes.
+        payload_get = payload.get
+        payload_market = payload_get("market") or payload_get("market_id") or market_id
+        if eng is None or payload_market != eng_market:
+            eng = get_engine(str(payload_market), asset_id)
+            eng_market = payload_market
         mid = eng.mid_price if eng else None
-        out.append((ingest_ts, mid))
+        ts_append(ingest_ts)
+        mid_append(nan if mid is None else mid)
     return out
 
 
@@ -95,27 +281,28 @@ def replay_to_chart_series(
 ) -> list[dict[str, Any]]:
     """
     Replay and return bucketed series for spread/depth/OFI charts.
-    Uses Python engine (use_rust=False) for depth_at_levels. Returns one row per bucket that has events.
+    Returns one row per bucket that has events.
     Each row: { ts, mid, spread, depth_bid, depth_ask, ofi }.
     OFI: buy pressure positive, sell pressure negative (bid size increase = +, ask size increase = -).
     """
-    aggregator = OrderBookAggregator(use_rust=False)
+    aggregator = OrderBookAggregator()
     rows: list[dict[str, Any]] = []
     current_bucket_ts: int | None = None
     current_bucket_ofi: float = 0.0
-    payload_market_for_engine: str | None = None
+    # Engine of the last book/delta applied for asset_id; _emit_bucket reads it from the closure
+    eng: OrderBookEngine | None = None
+    # Set whenever a book/delta is applied; buckets with only other events reuse the last metrics
+    book_dirty = True
+    last_metrics: tuple[float | None, float | None, float, float] = (None, None, 0.0, 0.0)
 
     def _emit_bucket(bucket_ts: int) -> None:
-        if payload_market_for_engine is None:
-            return
-        eng = aggregator.get_engine(payload_market_for_engine, asset_id)
-        if not eng:
+        nonlocal book_dirty, last_metrics
+        if eng is None:
             return
-        mid = eng.mid_price
-        spread = eng.spread
-        depth_bid_list, depth_ask_list = eng.depth_at_levels(depth_n)
-        depth_bid = sum(s for _, s in depth_bid_list)
-        depth_ask = sum(s for _, s in depth_ask_list)
+        if book_dirty:
+            last_metrics = (eng.mid_price, eng.spread, *eng.depth_sums)
+            book_dirty = False
+        mid, spread, depth_bid, depth_ask = last_metrics
         rows.append({
             "ts": bucket_ts,
             "mid": mid,
@@ -125,42 +312,40 @@ def replay_to_chart_series(
             "ofi": round(current_bucket_ofi, 6),
         })
 
-    for payload, ingest_ts in stream_raw_events(
-        conn, market_id=market_id, start_ts=start_ts, end_ts=end_ts
+    for ts_bucket, ingest_ts, payload in _stream_bucketed_asset_events(
+        conn, market_id, asset_id, start_ts, end_ts, bucket_ms
     ):
-        event_type = payload.get("event_type")
-        ts_bucket = (ingest_ts // bucket_ms) * bucket_ms
-        pm = str(payload.get("market") or payload.get("market_id") or market_id)
-        if pm:
-            payload_market_for_engine = pm
-
         if current_bucket_ts is not None and ts_bucket != current_bucket_ts:
             _emit_bucket(current_bucket_ts)
             current_bucket_ofi = 0.0
         current_bucket_ts = ts_bucket
+        if payload is None:
+            continue
 
+        event_type = payload.get("event_type")
         if event_type == "book":
             snap = parse_book_message(payload)
             if snap:
-                eng = aggregator._engine(snap.market_id, snap.asset_id)
+                if eng is None or eng.market_id != snap.market_id:
+                    eng = aggregator._engine(snap.market_id, asset_id)
+                    eng.track_depth(depth_n)
                 snap.ingest_ts = ingest_ts
                 eng.apply_snapshot(snap)
+                book_dirty = True
         elif event_type == "price_change":
             for delta in parse_price_change_message(payload):
+                if delta.asset_id != asset_id:
+                    continue
                 delta.ingest_ts = ingest_ts
-                eng = aggregator._engine(delta.market_id, delta.asset_id)
-                side_dict = getattr(eng, "bids", {}) if delta.side == "BUY" else getattr(eng, "asks", {})
-                price_key = round(delta.price, 6)
-                old_size = side_dict.get(price_key, 0.0)
-                eng.apply_delta(delta)
-                new_size = delta.size
-                delta_size = new_size - old_size
-                if delta.side == "BUY":
+                if eng is None or eng.market_id != delta.market_id:
+                    eng = aggregator._engine(delta.market_id, asset_id)
+                    eng.track_depth(depth_n)
+                delta_size = delta.size - eng.apply_delta(delta)
+                book_dirty = True
+                if delta.side_idx == 0:
                     current_bucket_ofi += delta_size
                 else:
                     current_bucket_ofi -= delta_size
-        else:
-            aggregator.on_message(payload, ingest_ts)
 
     if current_bucket_ts is not None:
         _emit_bucket(current_bucket_ts)
@@ -182,52 +367,79 @@ def replay_to_book_snapshots(
     Each row: { ts, mid, bids: [{ price, size }], asks: [{ price, size }] }.
     Prices are binned by tick_size; only levels in [mid - ticks_around_mid*tick, mid + ticks_around_mid*tick].
     """
-    aggregator = OrderBookAggregator(use_rust=False)
+    aggregator = OrderBookAggregator()
     rows: list[dict[str, Any]] = []
     last_ts_bucket: int | None = None
-    payload_market_for_engine: str | None = None
+    # Engine of the last book/delta applied for asset_id; _snapshot_for_bucket reads it from the closure
+    eng: OrderBookEngine | None = None
+    # Set whenever a book/delta is applied; otherwise a bucket repeats the last snapshot (or lack of one)
+    book_dirty = True
+    last_snapshot: dict[str, Any] | None = None
 
-    def _bin_price(p: float) -> float:
-        return round(round(p / tick_size) * tick_size, 6)
+    def _binned(levels: list[tuple[float, float]], descending: bool) -> list[dict[str, float]]:
+        """Sum level sizes per tick_size bin with one bincount instead of a per-level dict update."""
+        if not levels:
+            return []
+        arr = np.asarray(levels, dtype=np.float64)
+        sizes = arr[:, 1]
+        mask = sizes > 0
+        bins = np.rint(arr[mask, 0] / tick_size).astype(np.int64)
+        if not bins.size:
+            return []
+        bin_min = int(bins.min())
+        agg = np.bincount(bins - bin_min, weights=sizes[mask])
+        nz = np.flatnonzero(agg)
+        if descending:
+            nz = nz[::-1]
+        return [
+            {"price": round((bin_min + i) * tick_size, 6), "size": s}
+            for i, s in zip(nz.tolist(), agg[nz].tolist())
+        ]
 
-    def _snapshot_for_bucket(ts_bucket: int) -> None:
-        if payload_market_for_engine is None:
-            return
-        eng = aggregator.get_engine(payload_market_for_engine, asset_id)
-        if not eng or not hasattr(eng, "bids") or not hasattr(eng, "asks"):
-            return
+    def _build_snapshot() -> dict[str, Any] | None:
+        if eng is None or not eng.has_snapshot:
+            return None
         mid = eng.mid_price
         if mid is None:
-            return
+            return None
         lo = max(0.0, mid - ticks_around_mid * tick_size)
         hi = min(1.0, mid + ticks_around_mid * tick_size)
-        bids_dict = getattr(eng, "bids", {})
-        asks_dict = getattr(eng, "asks", {})
-        bids_agg: dict[float, float] = {}
-        for p, s in bids_dict.items():
-            if lo <= p <= hi and s > 0:
-                bp = _bin_price(p)
-                bids_agg[bp] = bids_agg.get(bp, 0) + s
-        asks_agg: dict[float, float] = {}
-        for p, s in asks_dict.items():
-            if lo <= p <= hi and s > 0:
-                ap = _bin_price(p)
-                asks_agg[ap] = asks_agg.get(ap, 0) + s
-        rows.append({
-            "ts": ts_bucket,
+        return {
             "mid": mid,
-            "bids": [{"price": p, "size": s} for p, s in sorted(bids_agg.items(), reverse=True)],
-            "asks": [{"price": p, "size": s} for p, s in sorted(asks_agg.items())],
-        })
+            "bids": _binned(eng.bids_in_range(lo, hi), descending=True),
+            "asks": _binned(eng.asks_in_range(lo, hi), descending=False),
+        }
+
+    def _snapshot_for_bucket(ts_bucket: int) -> None:
+        nonlocal book_dirty, last_snapshot
+        if book_dirty:
+            last_snapshot = _build_snapshot()
+            book_dirty = False
+        if last_snapshot is not None:
+            rows.append({"ts": ts_bucket, **last_snapshot})
 
-    for payload, ingest_ts in stream_raw_events(
-        conn, market_id=market_id, start_ts=start_ts, end_ts=end_ts
+    for ts_bucket, ingest_ts, payload in _stream_bucketed_asset_events(
+        conn, market_id, asset_id, start_ts, end_ts, bucket_ms
     ):
-        ts_bucket = (ingest_ts // bucket_ms) * bucket_ms
-        pm = str(payload.get("market") or payload.get("market_id") or market_id)
-        if pm:
-            payload_market_for_engine = pm
-        aggregator.on_message(payload, ingest_ts)
+        if payload is not None:
+            event_type = payload.get("event_type")
+            if event_type == "book":
+                snap = parse_book_message(payload)
+                if snap:
+                    if eng is None or eng.market_id != snap.market_id:
+                        eng = aggregator._engine(snap.market_id, asset_id)
+                    snap.ingest_ts = ingest_ts
+                    eng.apply_snapshot(snap)
+                    book_dirty = True
+            elif event_type == "price_change":
+                # Other assets' entries share the payload but never feed this heatmap
+                for delta in parse_price_change_message(payload):
+                    if delta.asset_id == asset_id:
+                        delta.ingest_ts = ingest_ts
+                        if eng is None or eng.market_id != delta.market_id:
+                            eng = aggregator._engine(delta.market_id, asset_id)
+                        eng.apply_delta(delta)
+                        book_dirty = True
         if last_ts_bucket is not None and ts_bucket != last_ts_bucket:
             _snapshot_for_bucket(last_ts_bucket)
         last_ts_bucket = ts_bucket
@@ -5,8 +5,11 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Any
 
+# Integer side codes (price_change parsing and the fill kernel)
+SIDE_IDX = {"BUY": 0, "SELL": 1}
 
-@dataclass
+
+@dataclass(slots=True)
 class Fill:
     """A simulated fill."""
 
@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class PortfolioState:
     """Current inventory and PnL."""
 
@@ -31,7 +31,7 @@ class PortfolioState:
         return peak - (self.realized_pnl + self.cash) if peak > 0 else 0.0
 
 
-@dataclass
+@dataclass(slots=True)
 class RunResult:
     """Result of a simulation run."""
 
@@ -2,17 +2,72 @@
 
 from __future__ import annotations
 
+import array
 import json
+import os
 import time
 import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from typing import Any
 
+import numpy as np
+
 from predexchange.ingestion.polymarket.normalize import parse_last_trade_message
 from predexchange.orderbook.aggregator import OrderBookAggregator
 from predexchange.replay.engine import stream_raw_events
-from predexchange.simulation.fill_model import TouchFillModel
+from predexchange.simulation.fill_model import SIDE_IDX
 from predexchange.simulation.portfolio import PortfolioState, RunResult
 from predexchange.simulation.strategy import Strategy
+from predexchange.storage.db import get_connection
+from predexchange.utils._njit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True)
+def _simulate_fills(
+    side_arr: Any, qprice_arr: Any, qsize_arr: Any, mid_arr: Any, ts_arr: Any, latency_ms: int
+) -> tuple:
+    """
+    Touch-fill every recorded quote and run the portfolio over the fills, in order.
+    Same rules as TouchFillModel.check_fill + PortfolioState.apply_fill (side 0=BUY, 1=SELL).
+    Returns (n_fills, fill_sides, fill_prices, fill_sizes, fill_ts, inventory, cash, realized_pnl).
+    """
+    n = len(side_arr)
+    fill_sides = np.empty(n, dtype=np.int8)
+    fill_prices = np.empty(n, dtype=np.float64)
+    fill_sizes = np.empty(n, dtype=np.float64)
+    fill_ts = np.empty(n, dtype=np.int64)
+    k = 0
+    inventory = 0.0
+    cash = 0.0
+    realized_pnl = 0.0
+    for i in range(n):
+        side = side_arr[i]
+        price = qprice_arr[i]
+        size = qsize_arr[i]
+        if size <= 0:
+            continue
+        if side == 0:
+            if mid_arr[i] > price:
+                continue
+            inventory += size
+            cash -= price * size
+        elif side == 1:
+            if mid_arr[i] < price:
+                continue
+            inventory -= size
+            cash += price * size
+        else:
+            continue
+        realized_pnl = cash + inventory * price
+        fill_sides[k] = side
+        fill_prices[k] = price
+        fill_sizes[k] = size
+        fill_ts[k] = ts_arr[i] + latency_ms
+        k += 1
+    return (
+        k, fill_sides[:k], fill_prices[:k], fill_sizes[:k], fill_ts[:k], inventory, cash, realized_pnl
+    )
 
 
 def run_simulation(
@@ -26,29 +81,51 @@ def run_simulation(
 ) -> RunResult:
     """Replay events for market, drive strategy, apply touch-fill, return RunResult."""
     aggregator = OrderBookAggregator()
-    fill_model = TouchFillModel(latency_ms=fill_latency_ms)
-    portfolio = PortfolioState()
     events_processed = 0
+    # Quotes seen at each book update, as typed columns; fills are resolved in one pass at the end
+    # (strategies never observe fills, so deferring them does not change the run).
+    q_side, q_price, q_size = array.array("b"), array.array("d"), array.array("d")
+    q_mid, q_ts = array.array("d"), array.array("q")
+    eng = None  # resolved once the engine exists; the aggregator never replaces it
+    # Bound once: the loop runs per replayed event
+    on_message, get_engine = aggregator.on_message, aggregator.get_engine
+    on_book_update, on_trade = strategy.on_book_update, strategy.on_trade
+    get_quotes = getattr(strategy, "get_quotes", None)  # MM-style strategies expose quotes
+    side_idx = SIDE_IDX.get
 
     for payload, ingest_ts in stream_raw_events(conn, market_id=market_id, start_ts=start_ts, end_ts=end_ts):
         events_processed += 1
-        aggregator.on_message(payload, ingest_ts)
-        eng = aggregator.get_engine(market_id, asset_id)
+        on_message(payload, ingest_ts)
+        if eng is None:
+            eng = get_engine(market_id, asset_id)
         if eng and eng.has_snapshot:
-            strategy.on_book_update(market_id, asset_id, eng)
+            on_book_update(market_id, asset_id, eng)
             # Touch-fill check for MM-style strategies that expose quotes
-            if hasattr(strategy, "get_quotes") and eng.mid_price is not None:
-                for side, quote_price, quote_size in strategy.get_quotes():
-                    fill = fill_model.check_fill(
-                        side, quote_price, quote_size, eng.mid_price, ingest_ts, market_id, asset_id
-                    )
-                    if fill:
-                        portfolio.apply_fill(fill.side, fill.price, fill.size)
+            mid = eng.mid_price
+            if get_quotes is not None and mid is not None:
+                for side, quote_price, quote_size in get_quotes():
+                    q_side.append(side_idx(side, -1))
+                    q_price.append(quote_price)
+                    q_size.append(quote_size)
+                    q_mid.append(mid)
+                    q_ts.append(ingest_ts)
         if payload.get("event_type") == "last_trade_price":
             trade = parse_last_trade_message(payload)
             if trade:
                 trade.ingest_ts = ingest_ts
-                strategy.on_trade(trade)
+                on_trade(trade)
+
+    columns: tuple[Any, ...] = (q_side, q_price, q_size, q_mid, q_ts)
+    if NUMBA_AVAILABLE:
+        # Zero-copy views for the compiled kernel; the Python fallback indexes array.array faster
+        columns = tuple(np.frombuffer(c, dtype=c.typecode) for c in columns)
+    n_fills, _, _, _, _, inventory, cash, realized_pnl = _simulate_fills(*columns, fill_latency_ms)
+    portfolio = PortfolioState(
+        inventory=float(inventory),
+        realized_pnl=float(realized_pnl),
+        cash=float(cash),
+        fill_count=int(n_fills),
+    )
 
     run_id = str(uuid.uuid4())[:8]
     return RunResult(
@@ -63,35 +140,106 @@ def run_simulation(
     )
 
 
+def _run_sweep_member(
+    db_path: str,
+    strategy: Strategy,
+    market_id: str,
+    asset_id: str,
+    start_ts: int | None,
+    end_ts: int | None,
+    fill_latency_ms: int,
+) -> RunResult:
+    """Worker body for run_simulation_sweep: own read-only connection, own aggregator."""
+    conn = get_connection(db_path, read_only=True)
+    try:
+        return run_simulation(conn, strategy, market_id, asset_id, start_ts, end_ts, fill_latency_ms)
+    finally:
+        conn.close()
+
+
+def run_simulation_sweep(
+    db_path: str | Path,
+    strategies: list[Strategy],
+    market_id: str,
+    asset_id: str,
+    start_ts: int | None = None,
+    end_ts: int | None = None,
+    fill_latency_ms: int = 0,
+    max_workers: int | None = None,
+    save: bool = True,
+) -> list[RunResult]:
+    """
+    Run one simulation per strategy (e.g. a parameter grid) in a process pool and return the
+    results in input order. Runs share nothing: each worker replays over its own read-only
+    DuckDB connection, so no writer may hold the database open meanwhile. With save=True the
+    results are written afterwards in one batch (save_run_results).
+    """
+    if not strategies:
+        return []
+    workers = min(max_workers or os.cpu_count() or 1, len(strategies))
+    db = str(db_path)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _run_sweep_member, db, strategy, market_id, asset_id, start_ts, end_ts, fill_latency_ms
+            )
+            for strategy in strategies
+        ]
+        results = [f.result() for f in futures]
+    if save:
+        conn = get_connection(db)
+        try:
+            save_run_results(conn, results)
+        finally:
+            conn.close()
+    return results
+
+
+# Parsed once at import; DuckDB's Python API has no prepare(), so batching goes through executemany
+_INSERT_RUN_SQL = """
+INSERT INTO sim_runs (run_id, strategy_name, market_id, params, final_inventory, realized_pnl, fill_count, events_processed, created_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SELECT_RUNS_SQL = (
+    "SELECT run_id, strategy_name, market_id, params, final_inventory, realized_pnl, fill_count, events_processed "
+    "FROM sim_runs WHERE run_id IN ({placeholders})"
+)
+
+
 def save_run_result(conn: Any, result: RunResult) -> None:
     """Persist RunResult to sim_runs table."""
-    conn.execute(
-        """
-        INSERT INTO sim_runs (run_id, strategy_name, market_id, params, final_inventory, realized_pnl, fill_count, events_processed, created_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+    save_run_results(conn, [result])
+
+
+def save_run_results(conn: Any, results: list[RunResult]) -> None:
+    """Persist many RunResults (e.g. a parameter sweep) with one executemany in a single transaction."""
+    if not results:
+        return
+    created_at = int(time.time() * 1000)
+    rows = [
         [
-            result.run_id,
-            result.strategy_name,
-            result.market_id,
-            json.dumps(result.params),
-            result.final_inventory,
-            result.realized_pnl,
-            result.fill_count,
-            result.events_processed,
-            int(time.time() * 1000),
-        ],
-    )
+            r.run_id,
+            r.strategy_name,
+            r.market_id,
+            json.dumps(r.params),
+            r.final_inventory,
+            r.realized_pnl,
+            r.fill_count,
+            r.events_processed,
+            created_at,
+        ]
+        for r in results
+    ]
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.executemany(_INSERT_RUN_SQL, rows)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
-def get_run_result(conn: Any, run_id: str) -> RunResult | None:
-    """Load RunResult by run_id."""
-    row = conn.execute(
-        "SELECT run_id, strategy_name, market_id, params, final_inventory, realized_pnl, fill_count, events_processed FROM sim_runs WHERE run_id = ?",
-        [run_id],
-    ).fetchone()
-    if not row:
-        return None
+def _row_to_run_result(row: tuple) -> RunResult:
     return RunResult(
         run_id=row[0],
         strategy_name=row[1],
@@ -102,3 +250,18 @@ def get_run_result(conn: Any, run_id: str) -> RunResult | None:
         events_processed=row[7],
         params=json.loads(row[3]) if row[3] else {},
     )
+
+
+def get_run_result(conn: Any, run_id: str) -> RunResult | None:
+    """Load RunResult by run_id."""
+    results = get_run_results(conn, [run_id])
+    return results[0] if results else None
+
+
+def get_run_results(conn: Any, run_ids: list[str]) -> list[RunResult]:
+    """Load RunResults for run_ids in one query, in the order given; unknown ids are skipped."""
+    if not run_ids:
+        return []
+    sql = _SELECT_RUNS_SQL.format(placeholders=", ".join("?" * len(run_ids)))
+    by_id = {row[0]: _row_to_run_result(row) for row in conn.execute(sql, list(run_ids)).fetchall()}
+    return [by_id[r] for r in run_ids if r in by_id]
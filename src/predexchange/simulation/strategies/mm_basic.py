@@ -2,7 +2,29 @@
 
 from __future__ import annotations
 
+from typing import Any
+
+import numpy as np
+
 from predexchange.simulation.strategy import MarketState, Strategy, TradePrintView
+from predexchange.utils._njit import njit
+
+
+@njit(cache=True)
+def _mm_quotes(mids: Any, spreads: Any, invs: Any, spread_frac: float, skew_per_unit: float) -> tuple:
+    """Bid/ask arrays for many ticks; same math as MMInventoryStrategy.on_book_update."""
+    n = mids.shape[0]
+    bids = np.empty(n)
+    asks = np.empty(n)
+    for i in range(n):
+        mid = mids[i]
+        half = max(spreads[i] * 0.5, spread_frac * mid)
+        skew = invs[i] * skew_per_unit
+        b = mid - half - skew
+        a = mid + half - skew
+        bids[i] = 0.0 if b < 0.0 else (1.0 if b > 1.0 else b)
+        asks[i] = 0.0 if a < 0.0 else (1.0 if a > 1.0 else a)
+    return (bids, asks)
 
 
 class MMInventoryStrategy(Strategy):
@@ -12,7 +34,10 @@ class MMInventoryStrategy(Strategy):
         self.spread_frac = spread_frac
         self.skew_per_unit = skew_per_unit
         self._inventory = 0.0
-        self._quotes: list[tuple[str, float, float]] = []  # (side, price, size) for fill model
+        # (side, price, size) for the fill model; allocated once, prices overwritten per tick
+        self._bid_q: list = ["BUY", 0.0, 10.0]
+        self._ask_q: list = ["SELL", 0.0, 10.0]
+        self._quoting = False
 
     def on_book_update(self, market_id: str, asset_id: str, state: MarketState) -> None:
         mid = state.mid_price
@@ -23,9 +48,24 @@ class MMInventoryStrategy(Strategy):
         skew = self._inventory * self.skew_per_unit
         bid = mid - half - skew
         ask = mid + half - skew
-        bid = max(0.0, min(1.0, bid))
-        ask = max(0.0, min(1.0, ask))
-        self._quotes = [("BUY", bid, 10.0), ("SELL", ask, 10.0)]
+        # Clamp to [0, 1] with comparisons rather than min/max calls
+        self._bid_q[1] = 0.0 if bid < 0.0 else (1.0 if bid > 1.0 else bid)
+        self._ask_q[1] = 0.0 if ask < 0.0 else (1.0 if ask > 1.0 else ask)
+        self._quoting = True
+
+    def quotes_for(self, mids: Any, spreads: Any, inventories: Any = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Batched on_book_update for backtests: bid and ask arrays for arrays of mids and spreads
+        (missing/zero spreads -> 0.01, as in the live path). inventories defaults to the current inventory.
+        """
+        mids = np.asarray(mids, dtype=np.float64)
+        spreads = np.nan_to_num(np.asarray(spreads, dtype=np.float64), nan=0.01)
+        spreads[spreads == 0.0] = 0.01
+        if inventories is None:
+            invs = np.full(mids.shape[0], self._inventory)
+        else:
+            invs = np.asarray(inventories, dtype=np.float64)
+        return _mm_quotes(mids, spreads, invs, self.spread_frac, self.skew_per_unit)
 
     def on_trade(self, trade: TradePrintView) -> None:
         if trade.side == "BUY":
@@ -33,5 +73,7 @@ class MMInventoryStrategy(Strategy):
         else:
             self._inventory += trade.size
 
-    def get_quotes(self) -> list[tuple[str, float, float]]:
-        return list(self._quotes)
+    def get_quotes(self) -> tuple[tuple[str, float, float], ...]:
+        if not self._quoting:
+            return ()
+        return (tuple(self._bid_q), tuple(self._ask_q))
@@ -2,21 +2,30 @@
 
 from __future__ import annotations
 
+import queue
+import threading
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import duckdb
+import structlog
+
+try:
+    import pyarrow  # noqa: F401  (DuckDB's Arrow export needs it)
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
 
 if TYPE_CHECKING:
     from duckdb import DuckDBPyConnection
 
-SCHEMA_SQL = """
--- Sequences for auto-increment IDs
-CREATE SEQUENCE IF NOT EXISTS event_seq START 1;
-CREATE SEQUENCE IF NOT EXISTS snap_seq START 1;
+log = structlog.get_logger(__name__)
 
--- Raw event log (append-only, event sourcing)
-CREATE TABLE IF NOT EXISTS raw_events (
+# Case/whitespace-insensitive, 0x-less form of raw_events.market_id (matches replay's _canonical_market_id)
+RAW_EVENTS_MARKET_KEY_SQL = "LOWER(REPLACE(TRIM(market_id), '0x', ''))"
+# Logged raw_events columns besides id (market_key is generated)
+_RAW_EVENTS_LOGGED_COLUMNS = "venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload"
+_RAW_EVENTS_TABLE_SQL = f"""(
     id              BIGINT PRIMARY KEY DEFAULT nextval('event_seq'),
     venue           VARCHAR NOT NULL,
     channel         VARCHAR NOT NULL,
@@ -25,8 +34,33 @@ CREATE TABLE IF NOT EXISTS raw_events (
     asset_id        VARCHAR,
     exchange_ts     BIGINT,
     ingest_ts       BIGINT NOT NULL,
-    payload         JSON NOT NULL
-);
+    payload         JSON NOT NULL,
+    -- Replay filters on it; generated, so no insert can leave it out
+    market_key      VARCHAR GENERATED ALWAYS AS ({RAW_EVENTS_MARKET_KEY_SQL}) VIRTUAL
+)"""
+# orderbook_snapshots columns other than the levels
+_SNAPSHOTS_SCALAR_COLUMNS = "id, market_id, asset_id, timestamp, best_bid, best_ask, mid_price, spread, imbalance"
+_SNAPSHOTS_TABLE_SQL = """(
+    id              BIGINT PRIMARY KEY DEFAULT nextval('snap_seq'),
+    market_id       VARCHAR NOT NULL,
+    asset_id        VARCHAR NOT NULL,
+    timestamp       BIGINT NOT NULL,
+    best_bid        DOUBLE,
+    best_ask        DOUBLE,
+    mid_price       DOUBLE,
+    spread          DOUBLE,
+    bids            STRUCT(price DOUBLE, size DOUBLE)[],
+    asks            STRUCT(price DOUBLE, size DOUBLE)[],
+    imbalance       DOUBLE
+)"""
+
+SCHEMA_SQL = f"""
+-- Sequences for auto-increment IDs
+CREATE SEQUENCE IF NOT EXISTS event_seq START 1;
+CREATE SEQUENCE IF NOT EXISTS snap_seq START 1;
+
+-- Raw event log (append-only, event sourcing)
+CREATE TABLE IF NOT EXISTS raw_events {_RAW_EVENTS_TABLE_SQL};
 
 -- Market metadata cache
 CREATE TABLE IF NOT EXISTS markets (
@@ -50,19 +84,7 @@ CREATE TABLE IF NOT EXISTS tracked_markets (
 );
 
 -- Derived orderbook snapshots (periodic materialized state)
-CREATE TABLE IF NOT EXISTS orderbook_snapshots (
-    id              BIGINT PRIMARY KEY DEFAULT nextval('snap_seq'),
-    market_id       VARCHAR NOT NULL,
-    asset_id        VARCHAR NOT NULL,
-    timestamp       BIGINT NOT NULL,
-    best_bid        DOUBLE,
-    best_ask        DOUBLE,
-    mid_price       DOUBLE,
-    spread          DOUBLE,
-    bids_json       JSON,
-    asks_json       JSON,
-    imbalance       DOUBLE
-);
+CREATE TABLE IF NOT EXISTS orderbook_snapshots {_SNAPSHOTS_TABLE_SQL};
 
 -- Simulation runs (strategy backtest results)
 CREATE TABLE IF NOT EXISTS sim_runs (
@@ -102,7 +124,10 @@ CREATE TABLE IF NOT EXISTS sports_games (
     turn                VARCHAR,
     finished_timestamp  VARCHAR,
     updated_at          BIGINT NOT NULL,
-    first_live_at       BIGINT
+    first_live_at       BIGINT,
+    -- LOWER(TRIM(...)) of league_abbreviation / status, for equality filters
+    league_key          VARCHAR,
+    status_key          VARCHAR
 );
 
 -- Event pairing: Polymarket <-> Kalshi (curated "same real-world event")
@@ -127,6 +152,20 @@ CREATE TABLE IF NOT EXISTS candidate_rejections (
 """
 
 
+# Secondary indexes (created after the migrations below), kept apart from SCHEMA_SQL so bulk loads can create them after the data is in
+# (every ART index adds work to each INSERT)
+INDEX_SQL = """
+-- Replay reads one market (by market_key) over an ingest_ts window in id order
+CREATE INDEX IF NOT EXISTS idx_raw_events_market_key_ts ON raw_events (market_key, ingest_ts, id);
+
+-- Per-asset lookups by exchange time
+CREATE INDEX IF NOT EXISTS idx_raw_events_market_asset_ts ON raw_events (market_id, asset_id, exchange_ts);
+
+-- Sports list filtered by league
+CREATE INDEX IF NOT EXISTS idx_sports_league_live ON sports_games (league_key, live, ended);
+"""
+
+
 def get_connection(db_path: str | Path, read_only: bool = False) -> DuckDBPyConnection:
     """Return a DuckDB connection. Caller must close or use as context manager.
     Use read_only=True when another process may be writing (e.g. predex track start)
@@ -137,21 +176,164 @@ def get_connection(db_path: str | Path, read_only: bool = False) -> DuckDBPyConn
     return duckdb.connect(str(path), read_only=read_only)
 
 
-def init_schema(conn: DuckDBPyConnection) -> None:
-    """Create tables and sequences if they do not exist."""
-    for stmt in SCHEMA_SQL.split(";"):
-        stmt = stmt.strip()
-        if stmt:
+def fetch_dicts(result: Any) -> list[dict[str, Any]]:
+    """
+    Rows of an executed query as dicts keyed by column name. With pyarrow the result is pulled as one
+    Arrow table and converted column-wise (no per-row tuple + zip); otherwise fetchall + zip.
+    """
+    if _PYARROW_AVAILABLE:
+        to_table = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table  # renamed in duckdb 1.5
+        return to_table().to_pylist()
+    columns = [d[0] for d in result.description]
+    return [dict(zip(columns, r)) for r in result.fetchall()]
+
+
+class PooledConnection:
+    """A pool-owned connection: close() (or leaving a with block) hands it back instead of closing."""
+
+    __slots__ = ("_conn", "_pool")
+
+    def __init__(self, conn: DuckDBPyConnection, pool: ConnectionPool) -> None:
+        self._conn = conn
+        self._pool = pool
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._conn, name)
+
+    def close(self) -> None:
+        if self._conn is not None:
+            conn, self._conn = self._conn, None
+            self._pool.release(conn)
+
+    def __enter__(self) -> PooledConnection:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """
+    Reuses up to max_idle DuckDB connections to one file, skipping the file open + catalog load
+    per request. Checkout is exclusive (a connection is never shared across threads); when the pool
+    is empty a new connection is opened, and surplus ones are closed on release.
+    Idle connections keep the file open, so only pool where this process already owns the
+    database (another process cannot take the write lock meanwhile).
+    """
+
+    def __init__(self, db_path: str | Path, read_only: bool = True, max_idle: int = 4) -> None:
+        self.db_path = Path(db_path)
+        self.read_only = read_only
+        self._idle: queue.LifoQueue[DuckDBPyConnection] = queue.LifoQueue(maxsize=max_idle)
+        if not read_only:
+            conn = get_connection(self.db_path)
+            init_schema(conn)
+            self.release(conn)
+
+    def acquire(self) -> PooledConnection:
+        """Check out a connection; close() it (or use `with`) to return it."""
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = get_connection(self.db_path, read_only=self.read_only)
+        return PooledConnection(conn, self)
+
+    def release(self, conn: DuckDBPyConnection) -> None:
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def close(self) -> None:
+        """Close all idle connections."""
+        while True:
             try:
-                conn.execute(stmt)
-            except duckdb.Error as e:
-                if "already exists" not in str(e).lower():
-                    raise
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+_pools: dict[tuple[str, bool], ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pooled_connection(db_path: str | Path, read_only: bool = True) -> PooledConnection:
+    """get_connection backed by a per-(path, read_only) ConnectionPool; close() returns it to the pool."""
+    key = (str(Path(db_path).resolve()), read_only)
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = ConnectionPool(db_path, read_only=read_only)
+    return pool.acquire()
+
+
+def init_schema(conn: DuckDBPyConnection, with_indexes: bool = True) -> None:
+    """Create tables and sequences if they do not exist.
+    with_indexes=False skips the secondary indexes (call create_indexes after a bulk load)."""
+    # Every statement is IF NOT EXISTS, so the script runs as one multi-statement call
+    conn.execute(SCHEMA_SQL)
+    # Migration: raw_events.market_key (existing DBs). DuckDB cannot add a generated column with
+    # ALTER, so the table is copied once; its indexes go with it and create_indexes rebuilds them.
+    # Errors propagate: inserts and replay both depend on the new layout
+    info = conn.execute("SELECT name FROM pragma_table_info('raw_events')").fetchall()
+    if "market_key" not in [r[0] for r in info]:
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            conn.execute(f"CREATE TABLE raw_events_migrate {_RAW_EVENTS_TABLE_SQL}")
+            conn.execute(
+                f"INSERT INTO raw_events_migrate (id, {_RAW_EVENTS_LOGGED_COLUMNS}) "
+                f"SELECT id, {_RAW_EVENTS_LOGGED_COLUMNS} FROM raw_events"
+            )
+            conn.execute("DROP TABLE raw_events")
+            conn.execute("ALTER TABLE raw_events_migrate RENAME TO raw_events")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
     # Migration: add first_live_at to sports_games if missing (existing DBs)
     try:
         info = conn.execute("SELECT name FROM pragma_table_info('sports_games')").fetchall()
         names = [r[0] for r in info]
         if "first_live_at" not in names:
             conn.execute("ALTER TABLE sports_games ADD COLUMN first_live_at BIGINT")
+        if "league_key" not in names:
+            conn.execute("ALTER TABLE sports_games ADD COLUMN league_key VARCHAR")
+            conn.execute("ALTER TABLE sports_games ADD COLUMN status_key VARCHAR")
+            conn.execute(
+                "UPDATE sports_games SET league_key = LOWER(TRIM(league_abbreviation)), status_key = LOWER(TRIM(status))"
+            )
     except duckdb.Error:
         pass
+    # Migration: orderbook_snapshots levels from JSON text ([[price, size], ...]) to typed lists.
+    # Copied into the new layout in one transaction (DuckDB cannot ADD, UPDATE and DROP columns of a
+    # keyed table in one), so a failed cast leaves the table as it was and the next start retries
+    info = conn.execute("SELECT name FROM pragma_table_info('orderbook_snapshots')").fetchall()
+    if "bids" not in [r[0] for r in info]:
+        levels = ", ".join(
+            f"list_transform(CAST({side}_json AS DOUBLE[][]), x -> {{'price': x[1], 'size': x[2]}})"
+            for side in ("bids", "asks")
+        )
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            conn.execute(f"CREATE TABLE orderbook_snapshots_migrate {_SNAPSHOTS_TABLE_SQL}")
+            conn.execute(
+                f"INSERT INTO orderbook_snapshots_migrate ({_SNAPSHOTS_SCALAR_COLUMNS}, bids, asks) "
+                f"SELECT {_SNAPSHOTS_SCALAR_COLUMNS}, {levels} FROM orderbook_snapshots"
+            )
+            conn.execute("DROP TABLE orderbook_snapshots")
+            conn.execute("ALTER TABLE orderbook_snapshots_migrate RENAME TO orderbook_snapshots")
+        except duckdb.Error as e:
+            conn.execute("ROLLBACK")
+            # JSON in another shape: the *_json columns stay for manual conversion
+            log.error("snapshot_levels_migration_failed", error=str(e))
+        else:
+            conn.execute("COMMIT")
+    if with_indexes:
+        create_indexes(conn)
+
+
+def create_indexes(conn: DuckDBPyConnection) -> None:
+    """Create the secondary indexes in INDEX_SQL if they do not exist."""
+    conn.execute(INDEX_SQL)
@@ -2,26 +2,81 @@
 
 from __future__ import annotations
 
-import json
+import sys
+import time
+from collections.abc import Callable, Sequence
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any
 
+try:
+    import pyarrow as pa
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+    pa = None
+
+from predexchange.storage.db import fetch_dicts
+from predexchange.utils._json import dumps
+
 if TYPE_CHECKING:
     from duckdb import DuckDBPyConnection
 
+RAW_EVENT_COLUMNS = (
+    "venue", "channel", "event_type", "market_id", "asset_id", "exchange_ts", "ingest_ts", "payload",
+)
+_INSERT_RAW_EVENT_SQL = (
+    f"INSERT INTO raw_events ({', '.join(RAW_EVENT_COLUMNS)}) VALUES ({', '.join('?' * len(RAW_EVENT_COLUMNS))})"
+)
+_INSERT_RAW_EVENTS_FROM_BATCH = (
+    f"INSERT INTO raw_events ({', '.join(RAW_EVENT_COLUMNS)}) SELECT * FROM _raw_events_batch"
+)
+if _PYARROW_AVAILABLE:
+    # payload (JSON) travels as VARCHAR; DuckDB casts on insert
+    RAW_EVENTS_ARROW_SCHEMA = pa.schema([
+        ("venue", pa.string()),
+        ("channel", pa.string()),
+        ("event_type", pa.string()),
+        ("market_id", pa.string()),
+        ("asset_id", pa.string()),
+        ("exchange_ts", pa.int64()),
+        ("ingest_ts", pa.int64()),
+        ("payload", pa.string()),
+    ])
 
-def normalize_condition_id(s: str) -> str:
-    """Canonicalize condition_id / market for matching (Gamma and CLOB WS use 0x + 64 hex)."""
-    s = (s or "").strip()
+
+@lru_cache(maxsize=8192)
+def _normalize_condition_id(s: str) -> str:
+    s = s.strip()
     if not s:
         return s
     if s.startswith("0x"):
         return "0x" + s[2:].lower()
-    return s.lower() if len(s) == 64 and all(c in "0123456789abcdefABCDEF" for c in s) else s
+    # isalnum rules out the whitespace fromhex() tolerates; fromhex() checks the digits in C
+    if len(s) == 64 and s.isascii() and s.isalnum():
+        try:
+            bytes.fromhex(s)
+        except ValueError:
+            return s
+        return s.lower()
+    return s
+
+
+def normalize_condition_id(s: str) -> str:
+    """Canonicalize condition_id / market for matching (Gamma and CLOB WS use 0x + 64 hex)."""
+    # Memoized: every event of a market carries the same id
+    return _normalize_condition_id(s or "")
+
+
+# Decoded messages carry a fresh str per event_type; rows held in a batch share these instead
+_EVENT_TYPES = {
+    t: sys.intern(t) for t in ("book", "price_change", "last_trade_price", "tick_size_change", "unknown")
+}
 
 
 def _extract_event_meta(payload: dict[str, Any]) -> tuple[str, str, str | None, int | None]:
     """Extract venue-level event_type, market_id, asset_id, exchange_ts from Polymarket-style message."""
     event_type = str(payload.get("event_type", "unknown"))
+    event_type = _EVENT_TYPES.get(event_type, event_type)
     market_id = normalize_condition_id(str(payload.get("market") or payload.get("market_id") or ""))
     asset_id = payload.get("asset_id")
     if asset_id is not None:
@@ -48,48 +103,158 @@ def append_raw_event(
     ingest_ts: int,
     payload: dict[str, Any],
 ) -> None:
-    """Append a single raw event. Prefer append_raw_events_batch for throughput."""
-    payload_json = json.dumps(payload)
+    """Append a single raw event (written before returning). For buffered writes use make_appender."""
+    payload_json = dumps(payload)
     conn.execute(
-        """
-        INSERT INTO raw_events (venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+        _INSERT_RAW_EVENT_SQL,
         [venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload_json],
     )
 
 
-def append_raw_events_batch(
+class RawEventAppender:
+    """
+    Buffered raw_events writer for the ingest hot path. DuckDB's Python API has no Appender, so rows
+    are collected here and written with one append_raw_events_batch call every max_rows rows or once
+    the oldest pending row is max_delay_ms old (checked on append). The caller owns it: flush() before
+    reading back and close() (or use `with`) when done, or buffered rows are lost.
+    With a sink, flushed batches are handed to sink(rows) instead (e.g. a writer thread's queue).
+    """
+
+    __slots__ = ("conn", "max_rows", "max_delay_ms", "sink", "_rows", "_first_ms")
+
+    def __init__(
+        self,
+        conn: DuckDBPyConnection,
+        max_rows: int = 1000,
+        max_delay_ms: int = 1000,
+        sink: Callable[[list[tuple[str, str, str, str, str | None, int | None, int, str]]], None] | None = None,
+    ):
+        self.conn = conn
+        self.max_rows = max_rows
+        self.max_delay_ms = max_delay_ms
+        self.sink = sink
+        self._rows: list[tuple[str, str, str, str, str | None, int | None, int, str]] = []
+        self._first_ms = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._rows)
+
+    def append_row(
+        self,
+        venue: str,
+        channel: str,
+        event_type: str,
+        market_id: str,
+        asset_id: str | None,
+        exchange_ts: int | None,
+        ingest_ts: int,
+        payload_json: str,
+    ) -> None:
+        self.append_rows([(venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload_json)])
+
+    def append_rows(self, rows: Sequence[tuple[str, str, str, str, str | None, int | None, int, str]]) -> None:
+        """Buffer prepared rows (prepare_polymarket_rows layout); flushes when a threshold trips."""
+        if not rows:
+            return
+        now_ms = int(time.monotonic() * 1000)
+        if not self._rows:
+            self._first_ms = now_ms
+        self._rows.extend(rows)
+        if len(self._rows) >= self.max_rows or now_ms - self._first_ms >= self.max_delay_ms:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        rows, self._rows = self._rows, []
+        if self.sink is not None:
+            self.sink(rows)
+        else:
+            append_raw_events_batch(self.conn, rows)
+
+    def close(self) -> None:
+        """Write out pending rows."""
+        self.flush()
+
+    def __enter__(self) -> RawEventAppender:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def make_appender(
     conn: DuckDBPyConnection,
+    max_rows: int = 1000,
+    max_delay_ms: int = 1000,
+    sink: Callable[[list[tuple[str, str, str, str, str | None, int | None, int, str]]], None] | None = None,
+) -> RawEventAppender:
+    """New RawEventAppender on conn (owned by the caller, who flushes it)."""
+    return RawEventAppender(conn, max_rows=max_rows, max_delay_ms=max_delay_ms, sink=sink)
+
+
+def raw_events_arrow_table(
     rows: list[tuple[str, str, str, str, str | None, int | None, int, str]],
+) -> Any:
+    """Columnar pyarrow Table (RAW_EVENTS_ARROW_SCHEMA) from raw_events row tuples."""
+    columns = list(zip(*rows)) if rows else [()] * len(RAW_EVENT_COLUMNS)
+    arrays = [pa.array(col, type=field.type) for col, field in zip(columns, RAW_EVENTS_ARROW_SCHEMA)]
+    return pa.Table.from_arrays(arrays, schema=RAW_EVENTS_ARROW_SCHEMA)
+
+
+def append_raw_events_batch(
+    conn: DuckDBPyConnection,
+    rows: list[tuple[str, str, str, str, str | None, int | None, int, str]] | Any,
 ) -> None:
-    """Append multiple raw events. Each row: (venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload_json)."""
+    """Append multiple raw events. Each row: (venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload_json).
+
+    With pyarrow installed the rows go in as one Arrow table (a single INSERT ... SELECT instead of
+    a bind/execute per row); rows may also be passed as a pyarrow Table/RecordBatch in that layout.
+    """
+    if _PYARROW_AVAILABLE:
+        if isinstance(rows, pa.RecordBatch):
+            table = pa.Table.from_batches([rows])
+        elif isinstance(rows, pa.Table):
+            table = rows
+        else:
+            if not rows:
+                return
+            table = raw_events_arrow_table(rows)
+        if table.num_rows == 0:
+            return
+        conn.register("_raw_events_batch", table)
+        try:
+            conn.execute(_INSERT_RAW_EVENTS_FROM_BATCH)
+        finally:
+            conn.unregister("_raw_events_batch")
+        return
     if not rows:
         return
-    conn.executemany(
-        """
-        INSERT INTO raw_events (venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        rows,
-    )
+    # One transaction, so a failed batch leaves nothing behind and can be retried as a whole
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.executemany(_INSERT_RAW_EVENT_SQL, rows)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
 def log_stats(conn: DuckDBPyConnection) -> dict[str, Any]:
     """Return event log statistics: total count, min/max ingest_ts, count by market_id."""
-    total = conn.execute("SELECT COUNT(*) FROM raw_events").fetchone()[0]
-    range_row = conn.execute(
-        "SELECT MIN(ingest_ts), MAX(ingest_ts) FROM raw_events"
+    # Count and range in one scan
+    total, min_ts, max_ts = conn.execute(
+        "SELECT COUNT(*), MIN(ingest_ts), MAX(ingest_ts) FROM raw_events"
     ).fetchone()
-    min_ts, max_ts = range_row[0], range_row[1]
-    by_market = conn.execute(
-        "SELECT market_id, COUNT(*) AS cnt FROM raw_events GROUP BY market_id ORDER BY cnt DESC LIMIT 20"
-    ).fetchall()
+    by_market = fetch_dicts(conn.execute(
+        'SELECT market_id, COUNT(*) AS "count" FROM raw_events GROUP BY market_id ORDER BY "count" DESC LIMIT 20'
+    ))
     return {
         "total_events": total,
         "min_ingest_ts": min_ts,
         "max_ingest_ts": max_ts,
-        "by_market": [{"market_id": r[0], "count": r[1]} for r in by_market],
+        "by_market": by_market,
     }
 
 
@@ -101,7 +266,7 @@ def prepare_polymarket_row(
 ) -> tuple[str, str, str, str, str | None, int | None, int, str]:
     """Build a raw_events row from a Polymarket WS message."""
     event_type, market_id, asset_id, exchange_ts = _extract_event_meta(payload)
-    payload_json = json.dumps(payload)
+    payload_json = dumps(payload)
     return (venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload_json)
 
 
@@ -110,37 +275,29 @@ def prepare_polymarket_rows(
     ingest_ts: int,
     venue: str = "polymarket",
     channel: str = "market",
-) -> list[tuple[str, str, str, str, str | None, int | None, int, str]]:
+) -> tuple[tuple[str, str, str, str, str | None, int | None, int, str], ...]:
     """
     Build raw_events row(s) from a Polymarket WS message.
     For 'price_change', returns one row per price_changes entry (asset_id is inside each entry).
     For other messages, returns a single row (same as prepare_polymarket_row).
     """
-    event_type = str(payload.get("event_type", "unknown"))
-    market_id = normalize_condition_id(str(payload.get("market") or payload.get("market_id") or ""))
-    ts = payload.get("timestamp")
-    try:
-        exchange_ts = int(ts) if ts is not None else None
-    except (TypeError, ValueError):
-        exchange_ts = None
-    if isinstance(exchange_ts, str):
-        try:
-            exchange_ts = int(exchange_ts)
-        except (TypeError, ValueError):
-            exchange_ts = None
-    payload_json = json.dumps(payload)
-
-    if event_type == "price_change":
-        changes = payload.get("price_changes") or []
-        rows = []
-        for pc in changes:
-            if not isinstance(pc, dict):
-                continue
-            asset_id = pc.get("asset_id")
-            if asset_id is not None:
-                asset_id = str(asset_id).strip() or None
-            if not asset_id:
-                continue
-            rows.append((venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload_json))
-        return rows if rows else [prepare_polymarket_row(payload, ingest_ts, venue, channel)]
-    return [prepare_polymarket_row(payload, ingest_ts, venue, channel)]
+    # Most messages are not price_change: one row, no per-entry loop
+    if payload.get("event_type") != "price_change":
+        return (prepare_polymarket_row(payload, ingest_ts, venue, channel),)
+
+    # Metadata and payload JSON computed once, shared by every row of the message
+    event_type, market_id, top_asset_id, exchange_ts = _extract_event_meta(payload)
+    payload_json = dumps(payload)
+    rows = []
+    for pc in payload.get("price_changes") or ():
+        if not isinstance(pc, dict):
+            continue
+        asset_id = pc.get("asset_id")
+        if asset_id is not None:
+            asset_id = str(asset_id).strip() or None
+        if not asset_id:
+            continue
+        rows.append((venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload_json))
+    if rows:
+        return tuple(rows)
+    return ((venue, channel, event_type, market_id, top_asset_id, exchange_ts, ingest_ts, payload_json),)
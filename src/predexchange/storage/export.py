@@ -5,28 +5,40 @@ from __future__ import annotations
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from predexchange.storage.event_log import RAW_EVENT_COLUMNS
+
 if TYPE_CHECKING:
     from duckdb import DuckDBPyConnection
 
 
+# ZSTD shrinks the JSON payload column well below the Snappy default; DuckDB's default row group size
+_PARQUET_OPTIONS = "FORMAT PARQUET, COMPRESSION ZSTD, ROW_GROUP_SIZE 122880"
+# Logged columns only (market_key is derived from market_id)
+_EXPORT_COLUMNS = "id, " + ", ".join(RAW_EVENT_COLUMNS)
+
+
 def export_events_to_parquet(
     conn: DuckDBPyConnection,
     output_path: str | Path,
     market_id: str | None = None,
+    preserve_order: bool = False,
 ) -> int:
-    """Export raw_events to a Parquet file. Optional filter by market_id. Returns row count."""
+    """Export raw_events to a Parquet file. Optional filter by market_id. Returns row count.
+    Rows are written in whatever order DuckDB's parallel writer produces unless preserve_order
+    (order by id when reading back); the setting is scoped to this COPY and never touches ingest."""
     path = Path(output_path).resolve()
     path.parent.mkdir(parents=True, exist_ok=True)
-    path_str = str(path).replace("\\", "\\\\")
-    if market_id:
-        conn.execute(
-            f"COPY (SELECT * FROM raw_events WHERE market_id = ?) TO '{path_str}' (FORMAT PARQUET)",
-            [market_id],
-        )
-        count = conn.execute("SELECT COUNT(*) FROM raw_events WHERE market_id = ?", [market_id]).fetchone()[0]
-    else:
-        conn.execute(
-            f"COPY (SELECT * FROM raw_events) TO '{path_str}' (FORMAT PARQUET)",
-        )
-        count = conn.execute("SELECT COUNT(*) FROM raw_events").fetchone()[0]
+    # COPY cannot bind its target as a parameter: quote it as a SQL string literal (backslash is literal)
+    path_sql = "'" + str(path).replace("'", "''") + "'"
+    where, params = ("WHERE market_id = ?", [market_id]) if market_id else ("", [])
+    # COPY returns the number of rows written, so no separate COUNT(*) pass over raw_events
+    if not preserve_order:
+        conn.execute("SET preserve_insertion_order = false")
+    try:
+        count = conn.execute(
+            f"COPY (SELECT {_EXPORT_COLUMNS} FROM raw_events {where}) TO {path_sql} ({_PARQUET_OPTIONS})", params
+        ).fetchone()[0]
+    finally:
+        if not preserve_order:
+            conn.execute("RESET preserve_insertion_order")
     return count
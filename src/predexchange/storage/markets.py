@@ -4,49 +4,106 @@ from __future__ import annotations
 
 import json
 import time
-from typing import TYPE_CHECKING
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+try:
+    import pyarrow as pa
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+    pa = None
 
 from predexchange.models import Market
+from predexchange.storage.db import fetch_dicts
+from predexchange.utils._json import dumps
 
 if TYPE_CHECKING:
     from duckdb import DuckDBPyConnection
 
+# Rows per multi-row VALUES statement (keeps the bound parameter list bounded)
+_VALUES_CHUNK = 500
+
+
+_MARKET_COLUMNS = (
+    "market_id", "venue", "title", "category", "volume_24h", "liquidity", "active", "outcomes", "last_updated",
+)
+_ON_CONFLICT_UPDATE = """
+ON CONFLICT (market_id) DO UPDATE SET
+    venue = excluded.venue,
+    title = excluded.title,
+    category = excluded.category,
+    volume_24h = excluded.volume_24h,
+    liquidity = excluded.liquidity,
+    active = excluded.active,
+    outcomes = excluded.outcomes,
+    last_updated = excluded.last_updated
+"""
+_UPSERT_MARKET_SQL = (
+    f"INSERT INTO markets ({', '.join(_MARKET_COLUMNS)}) VALUES ({', '.join('?' * len(_MARKET_COLUMNS))})"
+    + _ON_CONFLICT_UPDATE
+)
+_UPSERT_MARKETS_FROM_STAGING_SQL = (
+    f"INSERT INTO markets ({', '.join(_MARKET_COLUMNS)}) SELECT * FROM _staging_markets" + _ON_CONFLICT_UPDATE
+)
+if _PYARROW_AVAILABLE:
+    _MARKETS_ARROW_SCHEMA = pa.schema([
+        ("market_id", pa.string()),
+        ("venue", pa.string()),
+        ("title", pa.string()),
+        ("category", pa.string()),
+        ("volume_24h", pa.float64()),
+        ("liquidity", pa.float64()),
+        ("active", pa.bool_()),
+        ("outcomes", pa.string()),
+        ("last_updated", pa.int64()),
+    ])
+
+
+def _market_row(market: Market, now_ms: int) -> tuple:
+    return (
+        market.market_id,
+        market.venue,
+        market.title or market.question,
+        market.category,
+        market.volume_24h,
+        market.liquidity,
+        market.active,
+        dumps([o.model_dump() for o in market.outcomes]),
+        market.last_updated or now_ms,
+    )
+
 
 def upsert_market(conn: DuckDBPyConnection, market: Market) -> None:
     """Insert or replace a market in the markets table."""
-    outcomes_json = json.dumps([o.model_dump() for o in market.outcomes])
-    conn.execute(
-        """
-        INSERT INTO markets (market_id, venue, title, category, volume_24h, liquidity, active, outcomes, last_updated)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT (market_id) DO UPDATE SET
-            venue = excluded.venue,
-            title = excluded.title,
-            category = excluded.category,
-            volume_24h = excluded.volume_24h,
-            liquidity = excluded.liquidity,
-            active = excluded.active,
-            outcomes = excluded.outcomes,
-            last_updated = excluded.last_updated
-        """,
-        [
-            market.market_id,
-            market.venue,
-            market.title or market.question,
-            market.category,
-            market.volume_24h,
-            market.liquidity,
-            market.active,
-            outcomes_json,
-            market.last_updated or int(time.time() * 1000),
-        ],
-    )
+    conn.execute(_UPSERT_MARKET_SQL, _market_row(market, int(time.time() * 1000)))
 
 
 def upsert_markets(conn: DuckDBPyConnection, markets: list[Market]) -> None:
-    """Upsert multiple markets."""
-    for m in markets:
-        upsert_market(conn, m)
+    """
+    Upsert multiple markets in one statement: with pyarrow the rows are staged as an Arrow table and
+    merged with a single INSERT ... SELECT ... ON CONFLICT; otherwise one executemany in a transaction.
+    """
+    if not markets:
+        return
+    now_ms = int(time.time() * 1000)
+    # One row per market_id (last wins, as with sequential upserts); ON CONFLICT cannot hit a row twice
+    rows = list({m.market_id: _market_row(m, now_ms) for m in markets}.values())
+    if _PYARROW_AVAILABLE:
+        arrays = [pa.array(col, type=f.type) for col, f in zip(zip(*rows), _MARKETS_ARROW_SCHEMA)]
+        conn.register("_staging_markets", pa.Table.from_arrays(arrays, schema=_MARKETS_ARROW_SCHEMA))
+        try:
+            conn.execute(_UPSERT_MARKETS_FROM_STAGING_SQL)
+        finally:
+            conn.unregister("_staging_markets")
+        return
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.executemany(_UPSERT_MARKET_SQL, rows)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
 def set_tracked_markets(conn: DuckDBPyConnection, market_ids: list[str], venue: str = "polymarket") -> None:
@@ -61,31 +118,63 @@ def set_tracked_markets(conn: DuckDBPyConnection, market_ids: list[str], venue:
         pinned = {r[0] for r in rows}
     except Exception:
         pass
-    conn.execute("DELETE FROM tracked_markets")
-    for mid in market_ids:
-        conn.execute(
-            "INSERT INTO tracked_markets (market_id, venue, added_at, pinned) VALUES (?, ?, ?, ?)",
-            [mid, venue, now_ms, mid in pinned],
-        )
-
-
-def list_markets(conn: DuckDBPyConnection, tracked_only: bool = False) -> list[dict]:
-    """List markets (or tracked only) as list of dicts."""
+    market_ids = list(dict.fromkeys(market_ids))
+    # DELETE + multi-row INSERTs in one transaction: a few statements however long the list
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute("DELETE FROM tracked_markets")
+        for i in range(0, len(market_ids), _VALUES_CHUNK):
+            chunk = market_ids[i : i + _VALUES_CHUNK]
+            conn.execute(
+                "INSERT INTO tracked_markets (market_id, venue, added_at, pinned) VALUES "
+                + ", ".join(["(?, ?, ?, ?)"] * len(chunk)),
+                [v for mid in chunk for v in (mid, venue, now_ms, mid in pinned)],
+            )
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+
+@lru_cache(maxsize=None)
+def _list_markets_sql(tracked_only: bool, with_outcomes: bool) -> tuple[str, tuple[str, ...]]:
+    columns = _MARKET_COLUMNS if with_outcomes else tuple(c for c in _MARKET_COLUMNS if c != "outcomes")
     if tracked_only:
-        rows = conn.execute(
-            """
-            SELECT m.market_id, m.venue, m.title, m.category, m.volume_24h, m.liquidity, m.active, m.outcomes, m.last_updated
-            FROM markets m
-            JOIN tracked_markets t ON m.market_id = t.market_id
-            ORDER BY t.added_at
-            """
-        ).fetchall()
+        sql = (
+            f"SELECT {', '.join('m.' + c for c in columns)} FROM markets m "
+            "JOIN tracked_markets t ON m.market_id = t.market_id ORDER BY t.added_at"
+        )
     else:
-        rows = conn.execute(
-            "SELECT market_id, venue, title, category, volume_24h, liquidity, active, outcomes, last_updated FROM markets ORDER BY volume_24h DESC"
-        ).fetchall()
-    columns = ["market_id", "venue", "title", "category", "volume_24h", "liquidity", "active", "outcomes", "last_updated"]
-    return [dict(zip(columns, r)) for r in rows]
+        sql = f"SELECT {', '.join(columns)} FROM markets ORDER BY volume_24h DESC"
+    return sql, columns
+
+
+def list_markets(
+    conn: DuckDBPyConnection, tracked_only: bool = False, with_outcomes: bool = False
+) -> list[dict]:
+    """List markets (or tracked only) as list of dicts. outcomes (JSON) is only read when with_outcomes."""
+    sql, _ = _list_markets_sql(tracked_only, with_outcomes)
+    return fetch_dicts(conn.execute(sql))
+
+
+def iter_market_batches(
+    conn: DuckDBPyConnection,
+    tracked_only: bool = False,
+    with_outcomes: bool = False,
+    rows_per_batch: int = 1024,
+) -> Any:
+    """Stream list_markets rows as a pyarrow RecordBatchReader (requires pyarrow)."""
+    sql, _ = _list_markets_sql(tracked_only, with_outcomes)
+    result = conn.execute(sql)
+    to_reader = getattr(result, "to_arrow_reader", None)  # duckdb >= 1.5; fetch_record_batch before
+    return to_reader(rows_per_batch) if to_reader is not None else result.fetch_record_batch(rows_per_batch)
+
+
+def list_markets_arrow(
+    conn: DuckDBPyConnection, tracked_only: bool = False, with_outcomes: bool = False
+) -> Any:
+    """list_markets as one pyarrow Table (requires pyarrow)."""
+    return iter_market_batches(conn, tracked_only, with_outcomes).read_all()
 
 
 def get_tracked_market_ids(conn: DuckDBPyConnection) -> list[str]:
@@ -5,10 +5,42 @@ from __future__ import annotations
 import json
 from typing import TYPE_CHECKING, Any
 
+try:
+    import pyarrow as pa
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+    pa = None
+
 if TYPE_CHECKING:
     from duckdb import DuckDBPyConnection
 
 
+# SQL text kept at module level (DuckDB's Python API has no prepare(); executemany prepares once per batch)
+_INSERT_SNAPSHOT_SQL = """
+INSERT INTO orderbook_snapshots (market_id, asset_id, timestamp, best_bid, best_ask, mid_price, spread, bids, asks, imbalance)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_INSERT_SNAPSHOTS_FROM_STAGING_SQL = """
+INSERT INTO orderbook_snapshots (market_id, asset_id, timestamp, best_bid, best_ask, mid_price, spread, bids, asks, imbalance)
+SELECT * FROM _staging_snapshots
+"""
+if _PYARROW_AVAILABLE:
+    _LEVELS_TYPE = pa.list_(pa.struct([("price", pa.float64()), ("size", pa.float64())]))
+    _SNAPSHOTS_ARROW_SCHEMA = pa.schema([
+        ("market_id", pa.string()),
+        ("asset_id", pa.string()),
+        ("timestamp", pa.int64()),
+        ("best_bid", pa.float64()),
+        ("best_ask", pa.float64()),
+        ("mid_price", pa.float64()),
+        ("spread", pa.float64()),
+        ("bids", _LEVELS_TYPE),
+        ("asks", _LEVELS_TYPE),
+        ("imbalance", pa.float64()),
+    ])
+
+
 def append_snapshot(
     conn: DuckDBPyConnection,
     market_id: str,
@@ -18,16 +50,13 @@ def append_snapshot(
     best_ask: float | None,
     mid_price: float | None,
     spread: float | None,
-    bids_json: str,
-    asks_json: str,
+    bids: list[tuple[float, float]],
+    asks: list[tuple[float, float]],
     imbalance: float | None,
 ) -> None:
-    """Append one orderbook_snapshots row."""
+    """Append one orderbook_snapshots row; bids/asks are (price, size) levels. Prefer append_snapshots for many rows."""
     conn.execute(
-        """
-        INSERT INTO orderbook_snapshots (market_id, asset_id, timestamp, best_bid, best_ask, mid_price, spread, bids_json, asks_json, imbalance)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
+        _INSERT_SNAPSHOT_SQL,
         [
             market_id,
             asset_id,
@@ -36,13 +65,41 @@ def append_snapshot(
             best_ask,
             mid_price,
             spread,
-            bids_json,
-            asks_json,
+            _level_structs(bids),
+            _level_structs(asks),
             imbalance,
         ],
     )
 
 
+def append_snapshots(conn: DuckDBPyConnection, rows: list[tuple]) -> None:
+    """
+    Append many orderbook_snapshots rows (append_snapshot argument order, levels as (price, size)
+    tuples): one Arrow-staged INSERT ... SELECT with pyarrow, one executemany without.
+    """
+    if not rows:
+        return
+    if _PYARROW_AVAILABLE:
+        arrays = [pa.array(col, type=f.type) for col, f in zip(zip(*rows), _SNAPSHOTS_ARROW_SCHEMA)]
+        conn.register("_staging_snapshots", pa.Table.from_arrays(arrays, schema=_SNAPSHOTS_ARROW_SCHEMA))
+        try:
+            conn.execute(_INSERT_SNAPSHOTS_FROM_STAGING_SQL)
+        finally:
+            conn.unregister("_staging_snapshots")
+        return
+    conn.executemany(
+        _INSERT_SNAPSHOT_SQL,
+        [r[:7] + (_level_structs(r[7]), _level_structs(r[8]), r[9]) for r in rows],
+    )
+
+
+def _level_structs(levels: list[tuple[float, float]] | None) -> list[dict[str, float]] | None:
+    """(price, size) levels as dicts; DuckDB binds a Python tuple as a list, not a STRUCT."""
+    if levels is None:
+        return None
+    return [{"price": p, "size": s} for p, s in levels]
+
+
 def snapshot_from_engine(engine: Any, ingest_ts: int) -> None:
     """Helper: take current engine state and append to conn. Requires engine to have market_id, asset_id, and metrics."""
     # Used by caller who has conn and engine
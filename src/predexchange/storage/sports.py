@@ -4,56 +4,144 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any
 
+try:
+    import pyarrow as pa
+    _PYARROW_AVAILABLE = True
+except ImportError:
+    _PYARROW_AVAILABLE = False
+    pa = None
+
+from predexchange.storage.db import fetch_dicts
+
 if TYPE_CHECKING:
     from duckdb import DuckDBPyConnection
 
+_SPORT_COLUMNS = (
+    "game_id", "league_abbreviation", "slug", "home_team", "away_team", "status", "score",
+    "period", "elapsed", "live", "ended", "turn", "finished_timestamp", "updated_at", "first_live_at",
+    "league_key", "status_key",
+)
+_ON_CONFLICT_UPDATE = """
+ON CONFLICT (game_id) DO UPDATE SET
+    league_abbreviation = excluded.league_abbreviation,
+    slug = excluded.slug,
+    home_team = excluded.home_team,
+    away_team = excluded.away_team,
+    status = excluded.status,
+    score = excluded.score,
+    period = excluded.period,
+    elapsed = excluded.elapsed,
+    live = excluded.live,
+    ended = excluded.ended,
+    turn = excluded.turn,
+    finished_timestamp = excluded.finished_timestamp,
+    updated_at = excluded.updated_at,
+    first_live_at = COALESCE(sports_games.first_live_at, excluded.first_live_at),
+    league_key = excluded.league_key,
+    status_key = excluded.status_key
+"""
+# SQL text kept at module level; DuckDB's Python API has no prepare()
+_UPSERT_SPORT_RESULT_SQL = (
+    f"INSERT INTO sports_games ({', '.join(_SPORT_COLUMNS)}) VALUES ({', '.join('?' * len(_SPORT_COLUMNS))})"
+    + _ON_CONFLICT_UPDATE
+)
+_UPSERT_SPORT_RESULTS_FROM_STAGING_SQL = (
+    f"INSERT INTO sports_games ({', '.join(_SPORT_COLUMNS)}) SELECT * FROM _staging_sports" + _ON_CONFLICT_UPDATE
+)
+if _PYARROW_AVAILABLE:
+    _SPORTS_ARROW_SCHEMA = pa.schema([
+        ("game_id", pa.int64()),
+        ("league_abbreviation", pa.string()),
+        ("slug", pa.string()),
+        ("home_team", pa.string()),
+        ("away_team", pa.string()),
+        ("status", pa.string()),
+        ("score", pa.string()),
+        ("period", pa.string()),
+        ("elapsed", pa.string()),
+        ("live", pa.bool_()),
+        ("ended", pa.bool_()),
+        ("turn", pa.string()),
+        ("finished_timestamp", pa.string()),
+        ("updated_at", pa.int64()),
+        ("first_live_at", pa.int64()),
+        ("league_key", pa.string()),
+        ("status_key", pa.string()),
+    ])
+
+
+def _sport_row(payload: dict[str, Any], updated_at: int) -> tuple | None:
+    """sports_games row (column order of _SPORT_COLUMNS) from a sport_result message, or None without a gameId."""
+    get = payload.get
+    try:
+        game_id = int(get("gameId"))
+    except (TypeError, ValueError):
+        return None
+    live = bool(get("live", False))
+    league = str(get("leagueAbbreviation", ""))
+    status = str(get("status", ""))
+    return (
+        game_id,
+        league,
+        str(get("slug", "")),
+        str(get("homeTeam", "")),
+        str(get("awayTeam", "")),
+        status,
+        None if (score := get("score")) is None else str(score),
+        None if (period := get("period")) is None else str(period),
+        None if (elapsed := get("elapsed")) is None else str(elapsed),
+        live,
+        bool(get("ended", False)),
+        None if (turn := get("turn")) is None else str(turn),
+        None if (finished := get("finished_timestamp")) is None else str(finished),
+        updated_at,
+        updated_at if live else None,
+        league.strip().lower(),
+        status.strip().lower(),
+    )
+
 
 def upsert_sport_result(conn: DuckDBPyConnection, payload: dict[str, Any], updated_at: int) -> None:
     """Upsert one row into sports_games from a sport_result message."""
-    raw_id = payload.get("gameId")
-    if raw_id is None:
+    row = _sport_row(payload, updated_at)
+    if row is not None:
+        conn.execute(_UPSERT_SPORT_RESULT_SQL, row)
+
+
+def upsert_sport_results(conn: DuckDBPyConnection, results: list[tuple[dict[str, Any], int]]) -> None:
+    """
+    Upsert many (payload, updated_at) sport_result messages in one statement: with pyarrow they are
+    staged as an Arrow table and merged by a single INSERT ... SELECT ... ON CONFLICT, otherwise one
+    executemany in a transaction. Same end state as calling upsert_sport_result for each in order.
+    """
+    by_game: dict[int, tuple] = {}
+    for payload, updated_at in results:
+        row = _sport_row(payload, updated_at)
+        if row is None:
+            continue
+        prev = by_game.get(row[0])
+        if prev is not None and prev[14] is not None:
+            # ON CONFLICT cannot touch a row twice: keep the last message, but its first live tick
+            row = row[:14] + (prev[14],) + row[15:]
+        by_game[row[0]] = row
+    if not by_game:
         return
-    try:
-        game_id = int(raw_id)
-    except (TypeError, ValueError):
+    rows = list(by_game.values())
+    if _PYARROW_AVAILABLE:
+        arrays = [pa.array(col, type=f.type) for col, f in zip(zip(*rows), _SPORTS_ARROW_SCHEMA)]
+        conn.register("_staging_sports", pa.Table.from_arrays(arrays, schema=_SPORTS_ARROW_SCHEMA))
+        try:
+            conn.execute(_UPSERT_SPORT_RESULTS_FROM_STAGING_SQL)
+        finally:
+            conn.unregister("_staging_sports")
         return
-    league = str(payload.get("leagueAbbreviation", ""))
-    slug = str(payload.get("slug", ""))
-    home = str(payload.get("homeTeam", ""))
-    away = str(payload.get("awayTeam", ""))
-    status = str(payload.get("status", ""))
-    score = str(payload.get("score", "")) if payload.get("score") is not None else None
-    period = str(payload.get("period", "")) if payload.get("period") is not None else None
-    elapsed = str(payload.get("elapsed", "")) if payload.get("elapsed") is not None else None
-    live = bool(payload.get("live", False))
-    ended = bool(payload.get("ended", False))
-    turn = str(payload.get("turn", "")) if payload.get("turn") is not None else None
-    finished_ts = str(payload.get("finished_timestamp", "")) if payload.get("finished_timestamp") is not None else None
-
-    conn.execute(
-        """
-        INSERT INTO sports_games (
-            game_id, league_abbreviation, slug, home_team, away_team, status, score,
-            period, elapsed, live, ended, turn, finished_timestamp, updated_at, first_live_at
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ON CONFLICT (game_id) DO UPDATE SET
-            league_abbreviation = excluded.league_abbreviation,
-            slug = excluded.slug,
-            home_team = excluded.home_team,
-            away_team = excluded.away_team,
-            status = excluded.status,
-            score = excluded.score,
-            period = excluded.period,
-            elapsed = excluded.elapsed,
-            live = excluded.live,
-            ended = excluded.ended,
-            turn = excluded.turn,
-            finished_timestamp = excluded.finished_timestamp,
-            updated_at = excluded.updated_at,
-            first_live_at = COALESCE(sports_games.first_live_at, CASE WHEN excluded.live = TRUE THEN excluded.updated_at END)
-        """,
-        [game_id, league, slug, home, away, status, score, period, elapsed, live, ended, turn, finished_ts, updated_at, (updated_at if live else None)],
-    )
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.executemany(_UPSERT_SPORT_RESULT_SQL, rows)
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
 
 
 def list_sports_games(
@@ -70,31 +158,29 @@ def list_sports_games(
     """
     conditions = ["1=1"]
     params: list[Any] = []
+    # Case/whitespace-insensitive match against the normalized key columns
     if league:
-        conditions.append("LOWER(TRIM(league_abbreviation)) = LOWER(TRIM(?))")
-        params.append(league)
+        conditions.append("league_key = ?")
+        params.append(league.strip().lower())
     if status:
-        conditions.append("LOWER(TRIM(status)) = LOWER(TRIM(?))")
-        params.append(status)
+        conditions.append("status_key = ?")
+        params.append(status.strip().lower())
     where = " AND ".join(conditions)
     order = "live DESC, ended ASC, updated_at DESC" if live_first else "updated_at DESC"
     params.append(limit)
-    rows = conn.execute(
-        f"""
-        SELECT game_id, league_abbreviation, slug, home_team, away_team, status, score,
-               period, elapsed, live, ended, turn, finished_timestamp, updated_at, first_live_at
-        FROM sports_games
-        WHERE {where}
-        ORDER BY {order}
-        LIMIT ?
-        """,
-        params,
-    ).fetchall()
-    cols = [
-        "game_id", "league_abbreviation", "slug", "home_team", "away_team", "status", "score",
-        "period", "elapsed", "live", "ended", "turn", "finished_timestamp", "updated_at", "first_live_at",
-    ]
-    return [dict(zip(cols, r)) for r in rows]
+    return fetch_dicts(
+        conn.execute(
+            f"""
+            SELECT game_id, league_abbreviation, slug, home_team, away_team, status, score,
+                   period, elapsed, live, ended, turn, finished_timestamp, updated_at, first_live_at
+            FROM sports_games
+            WHERE {where}
+            ORDER BY {order}
+            LIMIT ?
+            """,
+            params,
+        )
+    )
 
 
 def get_sports_game(conn: DuckDBPyConnection, game_id: int | str) -> dict[str, Any] | None:
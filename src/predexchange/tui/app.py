@@ -9,6 +9,14 @@ from textual.app import App, ComposeResult
 from textual.containers import Container, Horizontal, Vertical
 from textual.reactive import reactive
 from textual.widgets import DataTable, Footer, Header, Static
+from textual.widgets.data_table import ColumnKey, RowKey
+
+try:
+    import uvloop  # not built for Windows
+    _UVLOOP_AVAILABLE = True
+except ImportError:
+    _UVLOOP_AVAILABLE = False
+    uvloop = None
 
 from predexchange.ingestion.manager import IngestionManager
 from predexchange.orderbook.aggregator import OrderBookAggregator
@@ -17,15 +25,15 @@ from predexchange.orderbook.aggregator import OrderBookAggregator
 class HealthPanel(Static):
     """WS connection health and msg rate."""
 
-    status = reactive("Starting...")
-    msg_count = reactive(0)
-    msgs_per_sec = reactive(0.0)
+    # (status, msg_count, msgs_per_sec) as one reactive: one assignment, one refresh per tick
+    stats: reactive[tuple[str, int, float]] = reactive(("Starting...", 0, 0.0))
 
     def render(self) -> str:
+        status, msg_count, msgs_per_sec = self.stats
         return (
-            f"[bold]Status[/] {self.status}  |  "
-            f"Messages: {self.msg_count}  |  "
-            f"Rate: {self.msgs_per_sec:.1f}/s"
+            f"[bold]Status[/] {status}  |  "
+            f"Messages: {msg_count}  |  "
+            f"Rate: {msgs_per_sec:.1f}/s"
         )
 
 
@@ -35,32 +43,49 @@ class MarketTable(DataTable):
     def __init__(self, aggregator: OrderBookAggregator, **kwargs: Any) -> None:
         super().__init__(**kwargs)
         self._aggregator = aggregator
+        self._column_keys: list[ColumnKey] = []
+        # (market_id, asset_id) -> row key / last rendered (mid, spread, bid, ask)
+        self._row_keys: dict[tuple[str, str], RowKey] = {}
+        self._last_values: dict[tuple[str, str], tuple[float | None, ...]] = {}
 
     def on_mount(self) -> None:
-        self.add_columns("Market", "Asset", "Mid", "Spread", "Bid", "Ask")
+        self._column_keys = self.add_columns("Market", "Asset", "Mid", "Spread", "Bid", "Ask")
 
     def refresh_rows(self) -> None:
-        self.clear()
-        self.add_columns("Market", "Asset", "Mid", "Spread", "Bid", "Ask")
-        for (market_id, asset_id), eng in self._aggregator.engines().items():
-            if not eng.has_snapshot:
-                continue
-            mid = eng.mid_price
-            spread = eng.spread
-            bb = eng.best_bid
-            ba = eng.best_ask
-            mid_s = f"{mid:.3f}" if mid is not None else "-"
-            spread_s = f"{spread:.3f}" if spread is not None else "-"
-            bb_s = f"{bb:.3f}" if bb is not None else "-"
-            ba_s = f"{ba:.3f}" if ba is not None else "-"
-            self.add_row(
-                market_id[:16] + "..." if len(market_id) > 16 else market_id,
-                asset_id[:12] + "..." if len(asset_id) > 12 else asset_id,
-                mid_s,
-                spread_s,
-                bb_s,
-                ba_s,
-            )
+        """Diff against the last refresh: add new books, drop gone ones, update only changed cells."""
+        seen: set[tuple[str, str]] = set()
+        for key, eng in self._aggregator.live_engines().items():
+            seen.add(key)
+            # Raw floats: an unchanged row is one tuple compare, formatted only when a cell moves
+            values = (eng.mid_price, eng.spread, eng.best_bid, eng.best_ask)
+            row_key = self._row_keys.get(key)
+            if row_key is None:
+                market_id, asset_id = key
+                self._row_keys[key] = self.add_row(
+                    _truncate(market_id, 16),
+                    _truncate(asset_id, 12),
+                    *map(_fmt_price, values),
+                    key=f"{market_id}:{asset_id}",
+                )
+            else:
+                last = self._last_values[key]
+                if last == values:
+                    continue
+                for col_key, old, new in zip(self._column_keys[2:], last, values):
+                    if old != new:
+                        self.update_cell(row_key, col_key, _fmt_price(new))
+            self._last_values[key] = values
+        for key in [k for k in self._row_keys if k not in seen]:
+            self.remove_row(self._row_keys.pop(key))
+            del self._last_values[key]
+
+
+def _truncate(s: str, n: int) -> str:
+    return s[:n] + "..." if len(s) > n else s
+
+
+def _fmt_price(value: float | None) -> str:
+    return "-" if value is None else f"{value:.3f}"
 
 
 class PredExTUI(App[None]):
@@ -77,6 +102,9 @@ class PredExTUI(App[None]):
             manager.orderbook_aggregator = self._aggregator
         self._stop_event = asyncio.Event()
         self._ingestion_task: asyncio.Task[None] | None = None
+        self._last_rev = -1
+        self._health: HealthPanel | None = None
+        self._table: MarketTable | None = None
 
     def compose(self) -> ComposeResult:
         yield Header()
@@ -85,6 +113,9 @@ class PredExTUI(App[None]):
         yield Footer()
 
     def on_mount(self) -> None:
+        # Resolved once; _refresh runs every 0.5 s
+        self._health = self.query_one(HealthPanel)
+        self._table = self.query_one(MarketTable)
         self._ingestion_task = asyncio.create_task(self._run_ingestion())
         self.set_interval(0.5, self._refresh)
 
@@ -93,12 +124,12 @@ class PredExTUI(App[None]):
 
     def _refresh(self) -> None:
         status = self._manager.get_status()
-        health = self.query_one(HealthPanel)
-        health.status = "Connected"
-        health.msg_count = status["msg_count"]
-        health.msgs_per_sec = status["msgs_per_sec"]
-        table = self.query_one(MarketTable)
-        table.refresh_rows()
+        self._health.stats = ("Connected", status["msg_count"], status["msgs_per_sec"])
+        # Table work only when a book moved since the last tick
+        rev = self._aggregator.revision
+        if rev != self._last_rev:
+            self._last_rev = rev
+            self._table.refresh_rows()
 
     def on_unmount(self) -> None:
         self._stop_event.set()
@@ -129,4 +160,10 @@ def run_tui(settings: Any) -> None:
         orderbook_aggregator=aggregator,
     )
     app = PredExTUI(manager)
-    app.run()
+    if _UVLOOP_AVAILABLE:
+        # Ingestion (websocket recv + decode) shares the app's loop, so run it on uvloop; uvloop.run
+        # passes loop_factory instead of the deprecated install() / event-loop policy
+        uvloop.run(app.run_async())
+    else:
+        # Without uvloop, textual runs on the default asyncio loop
+        app.run()
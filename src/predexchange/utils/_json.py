@@ -0,0 +1,30 @@
+"""JSON codec for hot paths - orjson when installed, stdlib json otherwise."""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    _ORJSON_AVAILABLE = False
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so one except clause covers both.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse JSON from str or bytes (bytes skip the UTF-8 decode to str with orjson)."""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any) -> str:
+    """Serialize to a compact JSON str."""
+    if _ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"))
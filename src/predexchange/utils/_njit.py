@@ -0,0 +1,21 @@
+"""Numba njit for numeric kernels - compiled when numba is installed, plain Python otherwise."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args: Any, **kwargs: Any) -> Any:
+        """No-op stand-in supporting both @njit and @njit(cache=True)."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def wrap(fn: Callable[..., Any]) -> Callable[..., Any]:
+            return fn
+
+        return wrap
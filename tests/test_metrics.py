@@ -0,0 +1,59 @@
+"""Live metrics unit tests."""
+
+import time
+
+from predexchange.metrics.live import MidPriceSeries, compute_snapshot_metrics, imbalance
+from predexchange.models.orderbook import OrderBookSnapshot, PriceLevel
+from predexchange.orderbook.engine import OrderBookEngine
+
+
+def test_mid_price_series_ring_wraps_and_keeps_order():
+    series = MidPriceSeries(maxlen=3)
+    assert series.volatility_proxy() is None
+    now = time.time()
+    for i, p in enumerate([0.40, 0.42, 0.44, 0.46, 0.48]):
+        series.push(now + i, p)
+    # Only the last 3 points survive, oldest first
+    assert [p for _, p in series.series()] == [0.44, 0.46, 0.48]
+    vol = series.volatility_proxy(window_sec=60.0)
+    assert vol is not None and abs(vol - 0.02) < 1e-9
+
+
+def test_mid_price_series_zero_maxlen_keeps_nothing():
+    series = MidPriceSeries(maxlen=0)
+    series.push(time.time(), 0.5)
+    assert series.series() == []
+    assert series.volatility_proxy() is None
+
+
+def test_imbalance_over_top_levels():
+    eng = OrderBookEngine("m1", "a1")
+    eng.apply_snapshot(
+        OrderBookSnapshot(
+            market_id="m1",
+            asset_id="a1",
+            bids=[PriceLevel(price=0.5, size=30), PriceLevel(price=0.49, size=10), PriceLevel(price=0.1, size=500)],
+            asks=[PriceLevel(price=0.52, size=20), PriceLevel(price=0.9, size=500)],
+        )
+    )
+    assert eng.top_volumes(2) == (40.0, 520.0)
+    assert abs(imbalance(eng, levels=1) - (30 - 20) / 50) < 1e-9
+
+
+def test_snapshot_metrics_match_engine():
+    bids = [(0.1, 500.0), (0.5, 30.0), (0.49, 10.0)]
+    asks = [(0.9, 500.0), (0.52, 20.0)]
+    eng = OrderBookEngine("m1", "a1")
+    eng.apply_snapshot(
+        OrderBookSnapshot(
+            market_id="m1",
+            asset_id="a1",
+            bids=[PriceLevel(price=p, size=s) for p, s in bids],
+            asks=[PriceLevel(price=p, size=s) for p, s in asks],
+        )
+    )
+    bb, ba, mid, spread, imb = compute_snapshot_metrics(bids, asks, levels=2)
+    assert (bb, ba) == (eng.best_bid, eng.best_ask)
+    assert abs(mid - eng.mid_price) < 1e-12 and abs(spread - eng.spread) < 1e-12
+    assert abs(imb - imbalance(eng, levels=2)) < 1e-12
+    assert compute_snapshot_metrics([], asks)[:4] == (None, 0.52, None, None)
@@ -3,7 +3,7 @@
 import pytest
 
 from predexchange.models.orderbook import OrderBookDelta, OrderBookSnapshot, PriceLevel
-from predexchange.orderbook.engine import OrderBookEngine, create_orderbook_engine
+from predexchange.orderbook.engine import OrderBookEngine, create_orderbook_engine, price_to_key
 
 
 def test_orderbook_snapshot_then_delta():
@@ -25,7 +25,7 @@ def test_orderbook_snapshot_then_delta():
     assert eng.best_bid == 0.49
     eng.apply_delta(OrderBookDelta(market_id="m1", asset_id="a1", side="SELL", price=0.54, size=10))
     assert eng.best_ask == 0.52  # still min of asks
-    assert 0.54 in eng.asks and eng.asks[0.54] == 10
+    assert price_to_key(0.54) in eng.asks and eng.asks[price_to_key(0.54)] == 10
 
 
 def test_create_engine_returns_python_or_rust():
@@ -33,3 +33,39 @@ def test_create_engine_returns_python_or_rust():
     assert hasattr(eng, "apply_snapshot")
     assert hasattr(eng, "apply_delta")
     assert hasattr(eng, "mid_price")
+
+
+def test_apply_delta_returns_prev_size_and_range_queries():
+    eng = create_orderbook_engine("m1", "a1")
+    eng.apply_snapshot(
+        OrderBookSnapshot(
+            market_id="m1",
+            asset_id="a1",
+            bids=[PriceLevel(price=0.5, size=100), PriceLevel(price=0.3, size=5)],
+            asks=[PriceLevel(price=0.52, size=80), PriceLevel(price=0.9, size=7)],
+        )
+    )
+    assert eng.apply_delta(OrderBookDelta(market_id="m1", asset_id="a1", side="BUY", price=0.5, size=40)) == 100
+    assert eng.apply_delta(OrderBookDelta(market_id="m1", asset_id="a1", side="SELL", price=0.55, size=3)) == 0.0
+    assert eng.apply_delta(OrderBookDelta(market_id="m1", asset_id="a1", side="SELL", price=0.52, size=0)) == 80
+    assert eng.bids_in_range(0.4, 0.6) == [(0.5, 40)]
+    assert eng.asks_in_range(0.4, 0.6) == [(0.55, 3)]
+    assert eng.depth_at_levels(1) == ([(0.5, 40)], [(0.55, 3)])
+
+
+def test_tracked_depth_sums_follow_top_levels():
+    eng = OrderBookEngine("m1", "a1")
+    eng.track_depth(2)
+    eng.apply_snapshot(
+        OrderBookSnapshot(
+            market_id="m1",
+            asset_id="a1",
+            bids=[PriceLevel(price=0.5, size=10), PriceLevel(price=0.4, size=20), PriceLevel(price=0.3, size=40)],
+            asks=[PriceLevel(price=0.6, size=1)],
+        )
+    )
+    assert eng.depth_sums == (30.0, 1.0)
+    eng.apply_delta(OrderBookDelta(market_id="m1", asset_id="a1", side="BUY", price=0.45, size=5))  # pushes 0.4 out
+    assert eng.depth_sums == (15.0, 1.0)
+    eng.apply_delta(OrderBookDelta(market_id="m1", asset_id="a1", side="BUY", price=0.5, size=0))  # pulls 0.4 in
+    assert eng.depth_sums == (25.0, 1.0) == eng.top_volumes(2)
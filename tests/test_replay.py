@@ -1,14 +1,14 @@
 """Replay determinism and golden test."""
 
-import json
 import tempfile
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 from predexchange.replay.engine import replay_to_mid_series, stream_raw_events
 from predexchange.storage.db import get_connection, init_schema
-from predexchange.storage.event_log import append_raw_event, prepare_polymarket_row
+from predexchange.storage.event_log import append_raw_event, append_raw_events_batch, prepare_polymarket_row
 
 
 @pytest.fixture
@@ -44,19 +44,78 @@ def test_replay_determinism(temp_db):
         "asks": [{"price": "0.43", "size": "70"}, {"price": "0.44", "size": "50"}],
         "timestamp": "2000",
     }
-    for payload, ingest_ts in [(book1, 100), (book2, 200)]:
-        row = prepare_polymarket_row(payload, ingest_ts)
-        temp_db.execute(
-            "INSERT INTO raw_events (venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            list(row),
-        )
-
-    series1 = replay_to_mid_series(temp_db, market_id, asset_id)
-    series2 = replay_to_mid_series(temp_db, market_id, asset_id)
-    assert series1 == series2
+    append_raw_events_batch(
+        temp_db, [prepare_polymarket_row(payload, ingest_ts) for payload, ingest_ts in [(book1, 100), (book2, 200)]]
+    )
+
+    ts1, mid1 = replay_to_mid_series(temp_db, market_id, asset_id).arrays()
+    ts2, mid2 = replay_to_mid_series(temp_db, market_id, asset_id).arrays()
+    assert np.array_equal(ts1, ts2)
+    assert np.array_equal(mid1, mid2, equal_nan=True)
+    series1 = list(replay_to_mid_series(temp_db, market_id, asset_id).points())
     assert len(series1) == 2
     # After book1 mid = (0.4+0.42)/2 = 0.41; after book2 mid = (0.41+0.43)/2 = 0.42
     assert series1[0][0] == 100
     assert series1[1][0] == 200
     assert abs((series1[0][1] or 0) - 0.41) < 0.001
     assert abs((series1[1][1] or 0) - 0.42) < 0.001
+
+
+def test_chart_series_buckets_and_ofi_for_one_asset(temp_db):
+    """OFI counts only the requested asset; events of other assets still mark their bucket."""
+    from predexchange.replay.engine import replay_to_chart_series
+    from predexchange.storage.event_log import prepare_polymarket_rows
+
+    market_id = "0xabc"
+    events = [
+        ({"event_type": "book", "market": market_id, "asset_id": "1",
+          "bids": [{"price": "0.4", "size": "100"}], "asks": [{"price": "0.42", "size": "80"}]}, 1000),
+        ({"event_type": "price_change", "market": market_id, "price_changes": [
+            {"asset_id": "1", "side": "BUY", "price": "0.4", "size": "130"},
+            {"asset_id": "2", "side": "SELL", "price": "0.6", "size": "1"},
+        ]}, 2500),
+        ({"event_type": "last_trade_price", "market": market_id, "asset_id": "2",
+          "price": "0.6", "size": "3", "side": "BUY"}, 3100),
+    ]
+    append_raw_events_batch(
+        temp_db, [row for payload, ingest_ts in events for row in prepare_polymarket_rows(payload, ingest_ts)]
+    )
+    rows = replay_to_chart_series(temp_db, "abc", "1", bucket_ms=1000)
+    assert [r["ts"] for r in rows] == [1000, 2000, 3000]
+    assert [r["ofi"] for r in rows] == [0.0, 30.0, 0.0]
+    assert rows[1]["depth_bid"] == 130.0
+
+
+def test_mid_series_sql_matches_python_replay(temp_db, monkeypatch):
+    """Book-only windows are computed in SQL; the result matches the event-by-event replay."""
+    from predexchange.replay import engine
+    from predexchange.storage.event_log import prepare_polymarket_rows
+
+    events = [
+        ({"event_type": "book", "market": "0xabc", "asset_id": "1",
+          "bids": [{"price": "0.4", "size": "100"}, {"price": "0.45", "size": "0"}],
+          "asks": [{"price": "0.42", "size": "80"}, {"price": "1.5", "size": "1"}]}, 100),
+        ({"event_type": "book", "market": "0xabc", "asset_id": "2",
+          "bids": [{"price": "0.5", "size": "1"}], "asks": []}, 200),
+        ({"event_type": "last_trade_price", "market": "0xabc", "asset_id": "1", "price": "0.41"}, 300),
+        ({"event_type": "book", "market": "0xabc", "asset_id": "1",
+          "bids": [], "buys": [{"price": "0.3", "size": "5"}], "asks": []}, 400),
+        ({"event_type": "book", "market": "0xabc", "asset_id": "1", "bids": [], "asks": []}, 500),
+    ]
+    append_raw_events_batch(
+        temp_db, [row for payload, ingest_ts in events for row in prepare_polymarket_rows(payload, ingest_ts)]
+    )
+    fast = list(engine.replay_to_mid_series(temp_db, "abc", "1").points())
+    monkeypatch.setattr(engine, "_has_price_changes", lambda *args: True)
+    slow = list(engine.replay_to_mid_series(temp_db, "abc", "1").points())
+    assert fast == slow
+    assert [None if m is None else round(m, 6) for _, m in fast] == [0.41, 0.41, 0.41, 0.3, None]
+
+
+def test_replay_matches_non_canonical_market_ids(temp_db):
+    """Ids normalize_condition_id leaves alone (tickers, stray whitespace) still match case-insensitively."""
+    payload = {"event_type": "last_trade_price", "market": "KXPres-24", "price": "0.5"}
+    append_raw_event(temp_db, "kalshi", "market", "last_trade_price", " KXPres-24 ", None, None, 100, payload)
+    assert list(stream_raw_events(temp_db, market_id="kxpres-24")) == [(payload, 100)]
+    assert list(stream_raw_events(temp_db, market_id="KXPRES-24")) == [(payload, 100)]
+    assert len(replay_to_mid_series(temp_db, "kxpres-24", "1")) == 1
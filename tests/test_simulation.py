@@ -0,0 +1,97 @@
+"""Fill model and portfolio unit tests."""
+
+import array
+from types import SimpleNamespace
+
+from predexchange.simulation.fill_model import SIDE_IDX, TouchFillModel
+from predexchange.simulation.portfolio import PortfolioState, RunResult
+from predexchange.simulation.runner import (
+    _simulate_fills,
+    get_run_result,
+    get_run_results,
+    run_simulation,
+    run_simulation_sweep,
+    save_run_results,
+)
+from predexchange.simulation.strategies.mm_basic import MMInventoryStrategy
+from predexchange.storage.db import get_connection, init_schema
+from predexchange.storage.event_log import append_raw_events_batch, prepare_polymarket_row
+
+
+def test_fill_kernel_matches_touch_fill_model():
+    model = TouchFillModel(latency_ms=5)
+    quotes = [("BUY", 0.50, 10.0, 0.49, 100), ("SELL", 0.60, 10.0, 0.49, 100), ("SELL", 0.45, 4.0, 0.49, 200)]
+    portfolio = PortfolioState()
+    fills = [f for f in (model.check_fill(*q) for q in quotes) if f is not None]
+    for f in fills:
+        portfolio.apply_fill(f.side, f.price, f.size)
+    assert [(f.side, f.timestamp) for f in fills] == [("BUY", 105), ("SELL", 205)]
+    assert portfolio.inventory == 6.0
+
+    cols = list(zip(*quotes))
+    n, sides, _, _, ts, inventory, cash, pnl = _simulate_fills(
+        array.array("b", [SIDE_IDX[s] for s in cols[0]]), *(array.array("d", c) for c in cols[1:4]),
+        array.array("q", cols[4]), 5,
+    )
+    assert n == portfolio.fill_count == 2
+    assert list(sides) == [0, 1] and list(ts) == [105, 205]
+    assert (inventory, cash, pnl) == (portfolio.inventory, portfolio.cash, portfolio.realized_pnl)
+
+
+def test_run_results_round_trip_in_batch(tmp_path):
+    conn = get_connection(tmp_path / "sim.duckdb")
+    init_schema(conn)
+    results = [
+        RunResult(f"r{i}", "MM", "0xabc", float(i), 0.5 * i, i, 100, params={"i": i}) for i in range(3)
+    ]
+    save_run_results(conn, results)
+    assert get_run_results(conn, ["r2", "missing", "r0"]) == [results[2], results[0]]
+    assert get_run_result(conn, "r1") == results[1]
+    conn.close()
+
+
+def test_mm_batched_quotes_match_live_path():
+    strat = MMInventoryStrategy(spread_frac=0.02, skew_per_unit=0.01)
+    strat._inventory = 3.0
+    mids, spreads = [0.5, 0.99, 0.01, 0.3], [0.04, None, 0.0, 0.002]
+    bids, asks = strat.quotes_for(mids, [s if s is not None else float("nan") for s in spreads])
+    for mid, spread, bid, ask in zip(mids, spreads, bids, asks):
+        strat.on_book_update("m", "a", SimpleNamespace(mid_price=mid, spread=spread))
+        assert strat.get_quotes() == (("BUY", bid, 10.0), ("SELL", ask, 10.0))
+
+
+def _book(bid: str, ask: str, ts: int) -> dict:
+    return {
+        "event_type": "book",
+        "market": "0xabc",
+        "asset_id": "123",
+        "bids": [{"price": bid, "size": "100"}],
+        "asks": [{"price": ask, "size": "100"}],
+        "timestamp": str(ts),
+    }
+
+
+def test_sweep_matches_sequential_runs_and_saves(tmp_path):
+    db_path = tmp_path / "sweep.duckdb"
+    conn = get_connection(db_path)
+    init_schema(conn)
+    books = [("0.40", "0.42"), ("0.55", "0.57"), ("0.30", "0.32"), ("0.45", "0.47")]
+    append_raw_events_batch(
+        conn, [prepare_polymarket_row(_book(bid, ask, i), 100 * (i + 1)) for i, (bid, ask) in enumerate(books)]
+    )
+    conn.close()
+
+    params = [(0.02, 0.001), (0.2, 0.01)]
+    results = run_simulation_sweep(
+        db_path, [MMInventoryStrategy(s, k) for s, k in params], "0xabc", "123", max_workers=2
+    )
+
+    conn = get_connection(db_path, read_only=True)
+    expected = [run_simulation(conn, MMInventoryStrategy(s, k), "0xabc", "123") for s, k in params]
+    assert [r.events_processed for r in results] == [4, 4]
+    # run_id is random per run; everything else must match the sequential runs, in input order
+    assert [(r.strategy_name, r.final_inventory, r.realized_pnl, r.fill_count, r.events_processed) for r in results] == [
+        (r.strategy_name, r.final_inventory, r.realized_pnl, r.fill_count, r.events_processed) for r in expected
+    ]
+    assert get_run_results(conn, [r.run_id for r in results]) == results
+    conn.close()
@@ -0,0 +1,159 @@
+"""Storage: raw event writes and bulk upserts (Arrow-staged and executemany paths)."""
+
+import pytest
+
+from predexchange.models.market import Market, Outcome
+from predexchange.storage import db, event_log, markets, snapshots, sports
+from predexchange.storage.db import get_connection, init_schema
+from predexchange.storage.event_log import append_raw_event, make_appender, prepare_polymarket_row
+
+
+@pytest.fixture(params=[True, False], ids=["arrow", "executemany"])
+def conn(request, monkeypatch, tmp_path):
+    """Connection with the pyarrow paths on (when installed) or forced off."""
+    if request.param:
+        pytest.importorskip("pyarrow")
+    else:
+        for module in (db, event_log, markets, snapshots, sports):
+            monkeypatch.setattr(module, "_PYARROW_AVAILABLE", False)
+    c = get_connection(tmp_path / "test.duckdb")
+    init_schema(c)
+    yield c
+    c.close()
+
+
+def test_append_raw_event_is_durable_without_flush(tmp_path):
+    path = tmp_path / "test.duckdb"
+    conn = get_connection(path)
+    init_schema(conn)
+    append_raw_event(conn, "polymarket", "market", "book", "0xabc", "1", 1, 2, {"event_type": "book"})
+    assert conn.execute("SELECT COUNT(*) FROM raw_events").fetchone()[0] == 1
+    conn.close()
+    conn = get_connection(path, read_only=True)
+    assert conn.execute("SELECT COUNT(*) FROM raw_events").fetchone()[0] == 1
+    conn.close()
+
+
+def test_appender_writes_pending_rows_on_close(tmp_path):
+    conn = get_connection(tmp_path / "test.duckdb")
+    init_schema(conn)
+    with make_appender(conn, max_rows=100) as appender:
+        appender.append_rows([prepare_polymarket_row({"event_type": "book", "market": "0xabc"}, 1)])
+        assert conn.execute("SELECT COUNT(*) FROM raw_events").fetchone()[0] == 0
+    assert conn.execute("SELECT COUNT(*) FROM raw_events").fetchone()[0] == 1
+    conn.close()
+
+
+def test_init_schema_migrates_raw_events_without_market_key(tmp_path):
+    conn = get_connection(tmp_path / "old.duckdb")
+    conn.execute(
+        "CREATE SEQUENCE event_seq START 1; CREATE TABLE raw_events (id BIGINT PRIMARY KEY DEFAULT nextval('event_seq'), "
+        "venue VARCHAR NOT NULL, channel VARCHAR NOT NULL, event_type VARCHAR NOT NULL, market_id VARCHAR NOT NULL, "
+        "asset_id VARCHAR, exchange_ts BIGINT, ingest_ts BIGINT NOT NULL, payload JSON NOT NULL)"
+    )
+    append_raw_event(conn, "polymarket", "market", "book", " 0xAB ", None, None, 1, {})
+    init_schema(conn)
+    # Any insert that names only the logged columns is matched by market_key
+    conn.execute(
+        "INSERT INTO raw_events (venue, channel, event_type, market_id, ingest_ts, payload) "
+        "VALUES ('kalshi', 'market', 'book', 'KX-1', 2, '{}')"
+    )
+    assert conn.execute("SELECT id, market_key FROM raw_events ORDER BY id").fetchall() == [(1, "ab"), (2, "kx-1")]
+    conn.close()
+
+
+def _old_snapshots_db(path, bids_json):
+    conn = get_connection(path)
+    conn.execute(
+        "CREATE SEQUENCE snap_seq START 1; CREATE TABLE orderbook_snapshots (id BIGINT PRIMARY KEY DEFAULT nextval('snap_seq'), "
+        "market_id VARCHAR NOT NULL, asset_id VARCHAR NOT NULL, timestamp BIGINT NOT NULL, best_bid DOUBLE, best_ask DOUBLE, "
+        "mid_price DOUBLE, spread DOUBLE, bids_json JSON, asks_json JSON, imbalance DOUBLE)"
+    )
+    conn.execute(
+        "INSERT INTO orderbook_snapshots (market_id, asset_id, timestamp, bids_json, asks_json) VALUES ('m', 'a', 1, ?, '[]')",
+        [bids_json],
+    )
+    return conn
+
+
+def _snapshot_columns(conn):
+    return {r[0] for r in conn.execute("SELECT name FROM pragma_table_info('orderbook_snapshots')").fetchall()}
+
+
+def test_init_schema_migrates_snapshot_levels(tmp_path):
+    conn = _old_snapshots_db(tmp_path / "old.duckdb", "[[0.5, 10]]")
+    init_schema(conn)
+    assert {"bids", "asks"} <= _snapshot_columns(conn) and "bids_json" not in _snapshot_columns(conn)
+    assert conn.execute("SELECT bids, asks FROM orderbook_snapshots").fetchone() == (
+        [{"price": 0.5, "size": 10.0}], []
+    )
+    conn.close()
+
+
+def test_failed_snapshot_levels_migration_leaves_json_columns(tmp_path):
+    conn = _old_snapshots_db(tmp_path / "old.duckdb", '{"bids": "not levels"}')
+    init_schema(conn)
+    # Rolled back as a whole: no half-added typed columns, so the next start tries again
+    columns = _snapshot_columns(conn)
+    assert {"bids_json", "asks_json"} <= columns and "bids" not in columns
+    assert conn.execute("SELECT bids_json FROM orderbook_snapshots").fetchone()[0] == '{"bids": "not levels"}'
+    conn.close()
+
+
+def test_raw_events_batch_round_trip(conn):
+    rows = [
+        prepare_polymarket_row({"event_type": "book", "market": "0xAB", "asset_id": 1, "timestamp": "5"}, 10),
+        prepare_polymarket_row({"event_type": "unknown", "market": "KX-1"}, 11),
+    ]
+    event_log.append_raw_events_batch(conn, rows)
+    stored = conn.execute(
+        "SELECT venue, channel, event_type, market_id, asset_id, exchange_ts, ingest_ts, payload, market_key "
+        "FROM raw_events ORDER BY id"
+    ).fetchall()
+    assert [r[:8] for r in stored] == rows
+    assert [r[8] for r in stored] == ["ab", "kx-1"]
+    stats = event_log.log_stats(conn)
+    assert stats["total_events"] == 2
+    assert sorted(stats["by_market"], key=lambda d: d["market_id"]) == [
+        {"market_id": "0xab", "count": 1},
+        {"market_id": "KX-1", "count": 1},
+    ]
+
+
+def test_upsert_markets_last_wins(conn):
+    outcome = Outcome(token_id="t1", name="Yes", price=0.5)
+    markets.upsert_markets(conn, [
+        Market(market_id="m1", title="old", last_updated=1),
+        Market(market_id="m2", title="other", active=False, last_updated=2),
+        Market(market_id="m1", title="new", outcomes=[outcome], last_updated=3),
+    ])
+    listed = {m["market_id"]: m for m in markets.list_markets(conn, with_outcomes=True)}
+    assert listed["m1"]["title"] == "new" and listed["m1"]["last_updated"] == 3
+    assert listed["m1"]["outcomes"] == '[{"token_id":"t1","name":"Yes","price":0.5}]'
+    assert listed["m2"]["active"] is False
+
+
+def test_upsert_sport_results_keeps_first_live_tick(conn):
+    base = {"gameId": 7, "leagueAbbreviation": " NFL", "status": "InProgress"}
+    sports.upsert_sport_results(conn, [
+        ({**base, "live": False}, 1),
+        ({**base, "live": True}, 2),
+        ({**base, "live": True, "score": "7-0"}, 3),
+    ])
+    sports.upsert_sport_results(conn, [({**base, "live": True, "score": "14-0"}, 4)])
+    (game,) = sports.list_sports_games(conn, league="nfl", status="inprogress")
+    assert (game["score"], game["updated_at"], game["first_live_at"]) == ("14-0", 4, 2)
+
+
+def test_append_snapshots_round_trip(conn):
+    rows = [
+        ("m", "a", 1, 0.4, 0.42, 0.41, 0.02, [(0.4, 10.0), (0.39, 5.0)], [(0.42, 3.0)], 0.5),
+        ("m", "a", 2, None, None, None, None, [], [], None),
+    ]
+    snapshots.append_snapshots(conn, rows)
+    stored = conn.execute(
+        "SELECT timestamp, bids, asks, imbalance FROM orderbook_snapshots ORDER BY timestamp"
+    ).fetchall()
+    assert stored[0][1] == [{"price": 0.4, "size": 10.0}, {"price": 0.39, "size": 5.0}]
+    assert stored[0][2] == [{"price": 0.42, "size": 3.0}]
+    assert stored[1][1:] == ([], [], None)